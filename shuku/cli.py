@@ -1,36 +1,53 @@
 import argparse
+import errno
+import hashlib
+import io
 import json
 import logging
+import multiprocessing
 import os
+import pickle
+import platform
 import re
 import shutil
 import signal
+import string
 import sys
 import tempfile
 import time
-from bisect import bisect_left
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime
 from difflib import SequenceMatcher
-from functools import wraps
+from fractions import Fraction
+from functools import lru_cache, wraps
 from importlib.metadata import version
+from itertools import accumulate, count
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Callable, Literal, Optional
+from stat import S_ISDIR, S_ISREG
+from typing import Any, Callable, Literal, Optional, Sequence, TextIO
 
 import pysubs2
 from ffmpeg import FFmpeg, FFmpegError
 from pysubs2.formats import (
     FILE_EXTENSION_TO_FORMAT_IDENTIFIER,
     FORMAT_IDENTIFIER_TO_FORMAT_CLASS,
+    get_format_identifier,
 )
-from pysubs2.formats.substation import parse_tags
 
 from shuku.config import (
     CONFIG_FILENAME,
     dump_default_config,
     load_config,
 )
-from shuku.logging_setup import setup_initial_logging, update_logging_level
+from shuku.logging_setup import (
+    forward_worker_logs,
+    setup_initial_logging,
+    setup_worker_logging,
+    update_logging_level,
+)
 from shuku.utils import (
     PROGRAM_NAME,
     PROGRAM_TAGLINE,
@@ -39,9 +56,76 @@ from shuku.utils import (
     prompt_user_choice,
 )
 
+try:
+    import orjson
+
+    json_loads: Callable[[str | bytes], Any] = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 SUBTITLE_EXTENSIONS = list(FILE_EXTENSION_TO_FORMAT_IDENTIFIER.keys())
+SUBTITLE_EXTENSION_SET = frozenset(SUBTITLE_EXTENSIONS)
 YEAR_PATTERN = r"\b(189[6-9]|19\d{2}|20\d{2}|21\d{2})\b"
 
+# Filename cleaning patterns, compiled once as they run for every file and subtitle candidate.
+_YEAR_RE = re.compile(YEAR_PATTERN)
+_EXTENSION_RE = re.compile(r"\.[^.]+$")
+_AUDIO_FORMAT_RE = re.compile(
+    r"\b(?:DTS(?:-HD)?|MA|DD?P?(?:\+?(?:Atmos|[1-9](?:\.[1-9])?))?|AC-?3?|AAC|FLAC|TrueHD|Atmos)(?:[-\s.]?(?:\d+\.?)+(?:ch)?)?\b",
+    re.IGNORECASE,
+)
+_BRACKETS_RE = re.compile(
+    rf"\((?!{YEAR_PATTERN}\))[^)]*\)|\[(?!{YEAR_PATTERN}\])[^\]]*\]"
+)
+_ENCODING_RE = re.compile(
+    r"\b([xh]\.*\d{3}.*|HEVC|AVC|U?HDRip|REPACK|(?:HYBRID[-\s]?)?REMUX|HYBRID)\b",
+    re.IGNORECASE,
+)
+_RESOLUTION_RE = re.compile(r"\b\d{3,5}x\d{3,4}p?\b|\b\d{3,4}p\b", re.IGNORECASE)
+_VIDEO_QUALITY_RE = re.compile(r"\b(U?HD|[248]K|[SH]DR1?0?)\b", re.IGNORECASE)
+_PUNCTUATION_RE = re.compile(r"[_\[\]{}<>|`~!@#\.%^*()=+]")
+# Display cleanup patterns for prepare_filename_for_display.
+_SOURCE_RE = re.compile(
+    r"\b(DV|Blu(-| )?Ray|NF|REMASTERED|HMAX|AMZN|DSNP|SESO|ATVP|HULU|WEB(-| )?(DL|RIP)?|DVDRip|BDRip)\b",
+    re.IGNORECASE,
+)
+_RELEASE_GROUP_CHARS = frozenset(string.ascii_letters + string.digits + "-")
+_TWO_CAPITALS_RE = re.compile(r"[a-z]*[A-Z][a-z]*[A-Z]")
+_LEADING_LOWERCASE_RE = re.compile(r"[A-Z]*[a-z]")
+_OTHER_TAGS_RE = re.compile(
+    r"\b(_-_|DoVi|E\.N\.D|DVD|PAL|CR|FUNI|U-NEXT|Dual[\. ]Audio|PROPER|JPN\+?ENG|JAP|GBR|ENG|JAPANESE|JPN|SUBBED|DUAL|Remaster|MA\.5\.1)\b",
+    re.IGNORECASE,
+)
+_END_YEAR_RE = re.compile(YEAR_PATTERN + r"\s*$")
+_DIGIT_RE = re.compile(r"\d")
+# Season and episode patterns, in priority order.
+SEASON_PATTERNS = (
+    r"\bS(\d+)(?=E\d+\b)",  # SxxExx.
+    r"\bS(\d+)\b",  # Sxx.
+    r"Season\s*(\d+)",  # "Season x".
+    r"_S(\d+)_",  # _Sxx_.
+    r"第(\d+)季",  # Japanese season format.
+)
+EPISODE_PATTERNS = (
+    r"\bE(\d+)\b",  # Standard (E01).
+    r"Ep?\.?\s*(\d+)\b",  # Ep01, Ep.01, E.01.
+    r"[_\s]-\s*(\d+)(?:v\d+)?",  # " - 01" or " - 01v2" format. Allows underscore before hyphen.
+    r"[_\s](\d+)(?:v\d+)?(?=[_\s]|$|\(|\[)",  # Standalone number, possibly followed by version (v2, v3, etc.), allowing underscore.
+    r"\[(\d+)(?:v\d+)?\]",  # [01] or [01v2].
+    r"第(\d+)[話话]",  # Japanese episode format.
+    r"#(\d+)",  # #01 format.
+)
+_VERSION_RE = re.compile(r"version\s+([\d.]+)")
+_GLOBAL_FLAGS_RE = re.compile(r"^(?:\(\?[aiLmsux]+\))+")
+_NUMERIC_GROUP_REFERENCE_RE = re.compile(r"\\[1-9]|\(\?\(\d")
+_SCOPED_FLAGS = (
+    (re.ASCII, "a"),
+    (re.IGNORECASE, "i"),
+    (re.MULTILINE, "m"),
+    (re.DOTALL, "s"),
+    (re.VERBOSE, "x"),
+)
+
 INCLUDE_DEMO_UTILS = False  # Set to True to load utils for the demo video.
 if INCLUDE_DEMO_UTILS:
     try:  # pragma: no cover
@@ -51,9 +135,54 @@ if INCLUDE_DEMO_UTILS:
 
 DEFAULT_MP3_VBR_QUALITY = "6"
 SUPPORTED_SUBTITLE_FORMATS = frozenset(sorted(FORMAT_IDENTIFIER_TO_FORMAT_CLASS.keys()))
+SUBTITLE_WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB.
 COVER_ART_DIMENSIONS_PIXELS = 500
 COVER_ART_PERCENTAGE_TO_GET_FRAME = 25
+CPU_COUNT = os.cpu_count() or 1
+# Default concurrent ffmpeg processes when extracting segments; each uses its own threads.
+SEGMENT_EXTRACTION_WORKERS = min(8, CPU_COUNT)
+SUBTITLE_CACHE_MAX_ENTRIES = 1000
+SUBTITLE_CACHE_MAX_AGE_SECONDS = 30 * 24 * 60 * 60  # 30 days.
 COVER_ART_UNSUPPORTED_CODECS = {"pcm_s16le", "copy", "libopus"}
+AUDIO_CODEC_EXTENSIONS = {
+    "aac": "m4a",
+    "alac": "m4a",
+    "flac": "flac",
+    "libmp3lame": "mp3",
+    "libopus": "ogg",
+    "pcm_s16le": "wav",
+}
+VIDEO_CODEC_EXTENSIONS = {
+    "libx264": "mp4",
+    "h264": "mp4",
+    "libx265": "mp4",
+    "hevc": "mp4",
+    "libvpx": "webm",
+    "vp8": "webm",
+    "libvpx-vp9": "webm",
+    "vp9": "webm",
+    "libaom-av1": "mp4",
+    "av1": "mp4",
+    "mpeg4": "mp4",
+    "libxvid": "avi",
+    "msmpeg4": "avi",
+    "flv": "flv",
+    "wmv2": "wmv",
+    "mjpeg": "avi",
+}
+# Custom arguments that would clash with the single-pass audio filter.
+AUDIO_FILTER_OPTIONS = {
+    "af",
+    "filter",
+    "filter:a",
+    "filter_complex",
+    "filter_complex_script",
+    "filter_script",
+    "filter_script:a",
+    "lavfi",
+}
+# Likewise for the single-pass video filter.
+VIDEO_FILTER_OPTIONS = AUDIO_FILTER_OPTIONS | {"vf", "filter:v", "filter_script:v"}
 PENALIZED_SUBTITLE_KEYWORDS = [
     "sign",
     "song",
@@ -63,6 +192,11 @@ PENALIZED_SUBTITLE_KEYWORDS = [
     "cc",
     "forced",
 ]
+# The lookahead finds keywords at every position, so overlapping ones
+# (e.g. "cc" in "ccomment") are all counted, like separate substring checks.
+_PENALIZED_KEYWORDS_RE = re.compile(
+    f"(?=({'|'.join(map(re.escape, PENALIZED_SUBTITLE_KEYWORDS))}))"
+)
 
 CODEC_TO_FORMAT_IDENTIFIER = {
     "ass": "ass",
@@ -85,6 +219,14 @@ try:
 except ImportError:  # pragma: no cover
     VERSION = "0.0.7"  # Managed by 'release' script.
 
+# Metadata shared by every condensed file.
+STATIC_METADATA = {
+    "artist": PROGRAM_NAME,
+    "genre": "Condensed Media",
+    "album": f"Condensed with {PROGRAM_NAME}",
+    "encoded_by": f"{PROGRAM_NAME} v{VERSION}",
+}
+
 
 class FileProcessingError(Exception):
     def __init__(self, file_path: str, message: str):
@@ -107,8 +249,14 @@ class Context:
         default_factory=lambda: {"audio": [], "subtitle": []}
     )
     selected_audio_stream: Optional[str] = None
+    original_audio_codec: Optional[str] = None
     original_subtitle_format: Optional[str] = None
     cover_image_path: Optional[str] = None
+    # Output extensions, resolved on first use.
+    audio_extension: Optional[str] = None
+    subtitle_extension: Optional[str] = None
+    video_extension: Optional[str] = None
+    output_directory: Optional[Path] = None
 
     @classmethod
     def create(
@@ -139,12 +287,11 @@ def log_execution_time(
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
                 result = func(*args, **kwargs)
             finally:
-                end_time = time.time()
-                duration = end_time - start_time
+                duration = time.perf_counter() - start_time
                 formatted_duration = format_duration(duration)
                 if message_template:
                     log_message = message_template.format(
@@ -163,6 +310,8 @@ def log_execution_time(
 
 def format_duration(seconds: float) -> str:
     total_seconds = int(seconds)
+    if total_seconds < 60:
+        return f"{total_seconds} sec"
     hours, remainder = divmod(total_seconds, 3600)
     minutes, seconds = divmod(remainder, 60)
     time_components = []
@@ -184,7 +333,6 @@ def main() -> None:
         if args.init:
             dump_default_config()
             sys.exit(0)
-        verify_ffmpeg_and_ffprobe_availability()
         try:
             config = load_config(args.config)
         except Exception as e:
@@ -192,6 +340,7 @@ def main() -> None:
             sys.exit(1)
         loglevel = args.loglevel or config.get("loglevel", "info")
         update_logging_level(loglevel)
+        verify_ffmpeg_and_ffprobe_availability()
         logging.debug(
             "Loaded config:"
             + "\n"
@@ -199,18 +348,19 @@ def main() -> None:
         )
         input_files = get_input_files(args.input)
         total_files = len(input_files)
-        successful_files = 0
-        for input_file in input_files:
-            try:
-                process_file(input_file, config, args)
-                successful_files += 1
-            except FFmpegError as e:
-                logging.error(f"FFmpeg error processing file {input_file}: {e.message}")
-                logging.debug(f"FFmpeg command: {' '.join(e.arguments)}")
-            except FileProcessingError as e:
-                logging.error(str(e))
-            except Exception as e:
-                logging.error(f"Error processing file {input_file}: {str(e)}")
+        jobs = min(getattr(args, "jobs", 1), total_files)
+        # Workers read this to split the CPU between their ffmpeg encodes.
+        args.jobs = jobs
+        if jobs > 1:
+            config = disable_prompts(config, args)
+            successful_files = process_files_in_parallel(
+                input_files, config, args, jobs
+            )
+        else:
+            successful_files = sum(
+                process_file_safely(input_file, config, args)
+                for input_file in input_files
+            )
         failed_files = total_files - successful_files
         emoji = " ✨" if successful_files and not failed_files else ""
         logging.info(f"Done!{emoji}")
@@ -227,13 +377,79 @@ def main() -> None:
         sys.exit(130)
 
 
+def disable_prompts(config: dict[str, Any], args: argparse.Namespace) -> dict[str, Any]:
+    """Answer prompts with their defaults; parallel workers can't read stdin."""
+    args.interactive = False
+    if config["if_file_exists"] != "ask":
+        return config
+    logging.warning(
+        "Prompts are unavailable when processing files in parallel; "
+        "existing output files will be renamed. "
+        "Set 'if_file_exists' in your configuration file to choose."
+    )
+    return {**config, "if_file_exists": "rename"}
+
+
+def process_files_in_parallel(
+    input_files: list[str],
+    config: dict[str, Any],
+    args: argparse.Namespace,
+    jobs: int,
+) -> int:
+    logging.info(f"Processing {len(input_files)} files with {jobs} parallel jobs…")
+    successful_files = 0
+    with forward_worker_logs() as log_queue:
+        executor = ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=init_worker,
+            initargs=(log_queue, logging.getLogger().getEffectiveLevel()),
+        )
+        try:
+            futures = {
+                executor.submit(
+                    process_file_safely, input_file, config, args
+                ): input_file
+                for input_file in input_files
+            }
+            for future in as_completed(futures):
+                try:
+                    successful_files += future.result()
+                except Exception as e:
+                    logging.error(f"Error processing file {futures[future]}: {str(e)}")
+        finally:
+            executor.shutdown(cancel_futures=True)
+    return successful_files
+
+
+def init_worker(log_queue: Any, loglevel: int) -> None:
+    # Ctrl+C is handled by the main process, which cancels pending files.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    setup_worker_logging(log_queue, loglevel)
+
+
+def process_file_safely(
+    input_file: str, config: dict[str, Any], args: argparse.Namespace
+) -> bool:
+    try:
+        process_file(input_file, config, args)
+        return True
+    except FFmpegError as e:
+        logging.error(f"FFmpeg error processing file {input_file}: {e.message}")
+        logging.debug(f"FFmpeg command: {' '.join(e.arguments)}")
+    except FileProcessingError as e:
+        logging.error(str(e))
+    except Exception as e:
+        logging.error(f"Error processing file {input_file}: {str(e)}")
+    return False
+
+
 @log_execution_time(log_level="debug", message_template="File processed in {1}")
 def process_file(
     file_path: str, config: dict[str, Any], args: argparse.Namespace
 ) -> None:
     logging.info(f"Processing {file_path}")
     exit_if_file_missing(file_path)
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with tempfile.TemporaryDirectory(dir=get_temp_directory(config)) as temp_dir:
         context = Context.create(file_path, config, args, temp_dir)
         context.stream_info = get_all_stream_info(file_path)
         # Extracting subs can be slow; we get all user input before processing.
@@ -246,33 +462,64 @@ def process_file(
         subtitle_path = find_subtitles(context)
         if context.config["condensed_subtitles.enabled"]:
             context.original_subtitle_format = get_subtitle_extension(context)
-        subtitles = pysubs2.load(subtitle_path)
+        subtitles = load_subtitles(context, subtitle_path)
         line_skip_patterns = context.config["line_skip_patterns"]
-        skip_patterns = [re.compile(pattern) for pattern in line_skip_patterns]
-        if skip_patterns:
-            filter_skip_patterns_in_place(subtitles, skip_patterns)
+        skip_patterns = compile_line_skip_patterns(tuple(line_skip_patterns))
         skip_intervals = get_skipped_chapter_intervals(context)
-        if skip_intervals:
-            filter_chapters_in_place(subtitles, skip_intervals)
-        speech_segments = extract_speech_timing_from_subtitles(context, subtitles)
+        speech_segments = extract_speech_timing_from_subtitles(
+            context, subtitles, skip_patterns, skip_intervals
+        )
         if not speech_segments:
             raise FileProcessingError(file_path, "No valid segments found")
         if config["condensed_subtitles.enabled"]:
             create_condensed_subtitles(context, subtitles, speech_segments)
         if context.selected_audio_stream:
+            # Read straight from the source when re-encoding anyway; only
+            # stream copies need the segments extracted first.
+            audio_from_source = can_select_audio_in_single_pass(context)
+            video_from_source = can_select_video_in_single_pass(context)
+            if audio_from_source:
+                create_condensed_audio_from_source(context, speech_segments)
+            if video_from_source:
+                create_condensed_video_from_source(context, speech_segments)
+            audio_from_segments = (
+                config["condensed_audio.enabled"] and not audio_from_source
+            )
+            video_from_segments = (
+                config["condensed_video.enabled"] and not video_from_source
+            )
+            if not (audio_from_segments or video_from_segments):
+                return
             segment_files = extract_segments(context, speech_segments)
-            if config["condensed_audio.enabled"]:
+            if audio_from_segments:
                 create_condensed_audio(context, segment_files)
-            if config["condensed_video.enabled"]:
+            if video_from_segments:
                 create_condensed_video(context, segment_files)
 
 
+def get_temp_directory(config: dict[str, Any]) -> Optional[str]:
+    temp_directory = config.get("temp_directory")
+    if not temp_directory:
+        return None  # Use the system default.
+    temp_directory = os.path.expanduser(temp_directory)
+    os.makedirs(temp_directory, exist_ok=True)
+    return str(temp_directory)
+
+
 def verify_ffmpeg_and_ffprobe_availability() -> None:
-    version_pattern = re.compile(r"version\s+([\d.]+)")
+    # Running the tools is only worth it to log their versions.
+    log_versions = logging.getLogger().isEnabledFor(logging.DEBUG)
     for tool in ["ffmpeg", "ffprobe"]:
+        if shutil.which(tool) is None:
+            logging.error(
+                f"{tool} not found. Make sure FFmpeg is installed and in your PATH."
+            )
+            sys.exit(1)
+        if not log_versions:
+            continue
         try:
             version_info = FFmpeg(executable=tool).option("version").execute()
-            match = version_pattern.search(version_info.decode())
+            match = _VERSION_RE.search(version_info.decode())
             version = match.group(1) if match else "Unknown"
             logging.debug(f"{tool} version: {version}")
         except Exception as e:
@@ -346,6 +593,19 @@ def parse_arguments() -> argparse.Namespace:
         metavar="<path>",
         help="Path to cover image, 'auto' (default), or 'disabled'.",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=positive_integer,
+        default=1,
+        metavar="<n>",
+        help="Number of files to process in parallel. Interactive prompts are unavailable when <n> is greater than 1. Default: 1.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or write the cache of parsed external subtitles.",
+    )
     parser.add_argument(
         "--init",
         action="store_true",
@@ -366,14 +626,26 @@ def parse_arguments() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def positive_integer(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return number
+
+
 def get_input_files(file_paths: list[str]) -> list[str]:
     input_files = []
     for file_path in file_paths:
         path = Path(file_path)
-        if path.is_file():
+        # One stat per input; follows symlinks like Path.is_file/is_dir.
+        try:
+            mode = os.stat(path).st_mode
+        except (OSError, ValueError):
+            mode = 0
+        if S_ISREG(mode):
             input_files.append(str(path))
-        elif path.is_dir():
-            input_files.extend(str(f) for f in path.rglob("*") if f.is_file())
+        elif S_ISDIR(mode):
+            input_files.extend(find_files_in_directory(str(path)))
         else:
             logging.warning(f'Invalid input or not found, skipping: "{path}"')
     if not input_files:
@@ -382,10 +654,31 @@ def get_input_files(file_paths: list[str]) -> list[str]:
     return input_files
 
 
+def find_files_in_directory(directory: str) -> list[str]:
+    # Like Path.rglob, it doesn't descend into symlinked directories.
+    files = []
+    subdirectories = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    files.append(entry.path)
+                elif entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+    except PermissionError:
+        logging.warning(f'Permission denied, skipping: "{directory}"')
+        return files
+    for subdirectory in subdirectories:
+        files.extend(find_files_in_directory(subdirectory))
+    return files
+
+
 def get_all_stream_info(file_path: str) -> dict[str, Any]:
     logging.debug("Getting stream info with ffprobe…")
     info = (
         FFmpeg(executable="ffprobe")
+        # By default ffprobe also dumps the stream listing to stderr; skip it.
+        .option("v", "error")
         .input(
             file_path,
             show_streams=None,
@@ -395,14 +688,19 @@ def get_all_stream_info(file_path: str) -> dict[str, Any]:
         )
         .execute()
     )
-    parsed = json.loads(info)
+    parsed = json_loads(info)
     streams = parsed.get("streams", [])
     if not streams:
         raise FileProcessingError(file_path, "No streams found")
+    streams_by_type: dict[str, list[dict[str, Any]]] = {
+        "video": [],
+        "audio": [],
+        "subtitle": [],
+    }
+    for stream in streams:
+        streams_by_type.get(stream["codec_type"], []).append(stream)
     return {
-        "video": [s for s in streams if s["codec_type"] == "video"],
-        "audio": [s for s in streams if s["codec_type"] == "audio"],
-        "subtitle": [s for s in streams if s["codec_type"] == "subtitle"],
+        **streams_by_type,
         "chapters": parsed.get("chapters", []),
         "format": parsed.get("format", {}),
     }
@@ -422,19 +720,35 @@ def select_audio_stream(context: Context) -> str:
                 f"Specified audio stream {context.args.audio_track_id} not found."
             )
     if audio_languages:
+        stream_languages = [
+            (stream.get("tags", {}).get("language", "").lower(), stream["index"])
+            for stream in streams
+        ]
         for lang in audio_languages:
-            for stream in streams:
-                tags = stream.get("tags", {})
-                if tags.get("language", "").lower().startswith(lang.lower()):
+            prefix = lang.lower()
+            for language, index in stream_languages:
+                if language.startswith(prefix):
                     logging.info(f"Using audio stream: {lang}")
-                    return str(stream["index"])
+                    return str(index)
     if len(streams) == 1:
         logging.info("Using the only available audio stream.")
         return str(streams[0]["index"])
-    return display_and_select_stream(streams, "audio")
+    return display_and_select_stream(
+        streams, "audio", interactive=getattr(context.args, "interactive", True)
+    )
 
 
-def display_and_select_stream(streams: list[dict[str, Any]], stream_type: str) -> str:
+def display_and_select_stream(
+    streams: list[dict[str, Any]], stream_type: str, interactive: bool = True
+) -> str:
+    if not interactive:
+        # What pressing Enter at the prompt would pick.
+        selected_stream = streams[0]
+        logging.info(
+            f"Using first {stream_type} stream, as prompts are unavailable: "
+            f"{format_stream_info(selected_stream, stream_type)}"
+        )
+        return str(selected_stream["index"])
     display_streams(streams, stream_type)
     selected_index = get_user_selection(streams, stream_type)
     selected_stream = next(s for s in streams if str(s["index"]) == selected_index)
@@ -445,9 +759,9 @@ def display_and_select_stream(streams: list[dict[str, Any]], stream_type: str) -
 
 
 def display_streams(streams: list[dict[str, Any]], stream_type: str) -> None:
-    print(f"\nAvailable {stream_type} streams:")
-    for stream in streams:
-        print(f"  {format_stream_info(stream, stream_type)}")
+    lines = [f"\nAvailable {stream_type} streams:"]
+    lines.extend(f"  {format_stream_info(stream, stream_type)}" for stream in streams)
+    print("\n".join(lines))
 
 
 def format_stream_info(stream: dict[str, Any], stream_type: str) -> str:
@@ -498,14 +812,11 @@ def create_metadata(context: Context) -> dict[str, str]:
     season, episode = extract_season_and_episode(context.clean_name, input_dirname)
     metadata = {
         "title": clean_name,
-        "artist": PROGRAM_NAME,
-        "genre": f"Condensed Media",
         "track": episode,
         "disc": season,
-        "album": f"Condensed with {PROGRAM_NAME}",
         "date": str(time.gmtime().tm_year),
-        "encoded_by": f"{PROGRAM_NAME} v{VERSION}",
         "comment": f"{context.basename} condensed with {PROGRAM_NAME} — {REPOSITORY}",
+        **STATIC_METADATA,
     }
     # See https://github.com/jonghwanhyeon/python-ffmpeg/issues/65.
     indexed_metadata = {
@@ -630,7 +941,12 @@ def find_subtitles(context: Context) -> str:
             search_locations.append(("provided directory", subtitles_path))
         else:
             raise ValueError(f"Invalid path provided for subtitles: {subtitles_path}")
-    if context.config["external_subtitle_search"] != "disabled":
+    searched_directories = {directory.resolve() for _, directory in search_locations}
+    if (
+        context.config["external_subtitle_search"] != "disabled"
+        # Don't probe the same directory twice.
+        and file_path.parent not in searched_directories
+    ):
         search_locations.append(("input file directory", file_path.parent))
     for location_name, directory in search_locations:
         matched_sub = find_matching_subtitle_file(
@@ -668,41 +984,56 @@ def find_fuzzy_subtitle_match(
     input_name: str,
 ) -> Optional[str]:
     logging.debug("No exact match found. Trying fuzzy matching.")
-    # Find all subtitle files in the directory.
-    all_subs = [
-        f
-        for f in os.listdir(directory)
-        if os.path.splitext(f)[1].lower() in SUBTITLE_EXTENSIONS
-    ]
+    all_subs = list_subtitle_files(directory)
     if not all_subs:
         logging.debug("No subtitle files found in the directory.")
         return None
     cleaned_input_name = prepare_filename_for_matching(input_name)
-    similarity_scores = []
+    cleaned_sub_names = {
+        sub_file: prepare_filename_for_matching(os.path.splitext(sub_file)[0])
+        for sub_file in all_subs
+    }
     logging.debug(f"Finding best match amongst {len(all_subs)} subtitle files…")
-    for sub_file in all_subs:
-        cleaned_sub_name = prepare_filename_for_matching(os.path.splitext(sub_file)[0])
-        similarity = character_based_similarity(cleaned_input_name, cleaned_sub_name)
-        similarity_scores.append((sub_file, similarity))
-    similarity_scores.sort(key=lambda x: x[1], reverse=True)
-    threshold = context.config["subtitle_match_threshold"]
-    if similarity_scores and similarity_scores[0][1] >= threshold:
-        best_match = os.path.join(directory, similarity_scores[0][0])
-        logging.info(
-            f"Fuzzy match found: {best_match} (similarity: {similarity_scores[0][1]:.2f})"
+    best_sub, best_score = "", -1.0
+    for sub_file, cleaned_name in cleaned_sub_names.items():
+        score = character_based_similarity(
+            cleaned_input_name, cleaned_name, score_to_beat=best_score
         )
+        # On ties, the first candidate wins.
+        if score > best_score:
+            best_sub, best_score = sub_file, score
+    threshold = context.config["subtitle_match_threshold"]
+    if best_score >= threshold:
+        best_match = os.path.join(directory, best_sub)
+        logging.info(f"Fuzzy match found: {best_match} (similarity: {best_score:.2f})")
         return best_match
     logging.debug(f"No fuzzy match found with threshold {threshold}.")
-    logging.debug(
-        f"Best match: {similarity_scores[0][0]} ({similarity_scores[0][1]:.2f})"
-    )
+    logging.debug(f"Best match: {best_sub} ({best_score:.2f})")
     return None
 
 
+def list_subtitle_files(directory: str) -> tuple[str, ...]:
+    real_directory = os.path.realpath(directory)
+    # The modification time invalidates the cache when files are added or removed.
+    return _list_subtitle_files(real_directory, os.stat(real_directory).st_mtime_ns)
+
+
+@lru_cache(maxsize=128)
+def _list_subtitle_files(directory: str, mtime_ns: int) -> tuple[str, ...]:
+    with os.scandir(directory) as entries:
+        return tuple(
+            entry.name
+            for entry in entries
+            if os.path.splitext(entry.name)[1].lower() in SUBTITLE_EXTENSION_SET
+            and entry.is_file()
+        )
+
+
+@lru_cache(maxsize=4096)
 def prepare_filename_for_matching(filename: str) -> str:
     filename = clean_filename(filename)
     # Extract all years.
-    years = re.findall(YEAR_PATTERN, filename)
+    years = _YEAR_RE.findall(filename)
     # Convert to lowercase.
     words = filename.lower().split()
     # Remove years from the cleaned words.
@@ -712,48 +1043,40 @@ def prepare_filename_for_matching(filename: str) -> str:
     return " ".join(words).strip()
 
 
+@lru_cache(maxsize=4096)
 def clean_filename(filename: str) -> str:
     # Remove file extension.
-    filename = re.sub(r"\.[^.]+$", "", filename)
+    filename = _EXTENSION_RE.sub("", filename)
     # Audio format.
-    filename = re.sub(
-        r"\b(?:DTS(?:-HD)?|MA|DD?P?(?:\+?(?:Atmos|[1-9](?:\.[1-9])?))?|AC-?3?|AAC|FLAC|TrueHD|Atmos)(?:[-\s.]?(?:\d+\.?)+(?:ch)?)?\b",
-        "",
-        filename,
-        flags=re.IGNORECASE,
-    )
+    filename = _AUDIO_FORMAT_RE.sub("", filename)
     # Remove content within brackets and parentheses, except years.
-    filename_sans_brackets = re.sub(
-        rf"\((?!{YEAR_PATTERN}\))[^)]*\)|\[(?!{YEAR_PATTERN}\])[^\]]*\]", "", filename
-    )
+    filename_sans_brackets = _BRACKETS_RE.sub("", filename)
     # In case everything was enclosed in brackets/paren.
     if filename_sans_brackets:
         filename = filename_sans_brackets
     # Encoding.
-    filename = re.sub(
-        r"\b([xh]\.*\d{3}.*|HEVC|AVC|U?HDRip|REPACK|(?:HYBRID[-\s]?)?REMUX|HYBRID)\b",
-        "",
-        filename,
-        flags=re.IGNORECASE,
-    )
+    filename = _ENCODING_RE.sub("", filename)
     # Resolution.
-    filename = re.sub(
-        r"\b\d{3,5}x\d{3,4}p?\b|\b\d{3,4}p\b", "", filename, flags=re.IGNORECASE
-    )
+    filename = _RESOLUTION_RE.sub("", filename)
     # Video quality.
-    filename = re.sub(
-        r"\b(U?HD|[248]K|[SH]DR1?0?)\b", "", filename, flags=re.IGNORECASE
-    )
+    filename = _VIDEO_QUALITY_RE.sub("", filename)
     # Replace non-alphanumeric characters with spaces, except apostrophes, colons, dash and +.
-    filename = re.sub(r"[_\[\]{}<>|`~!@#\.%^*()=+]", " ", filename)
-    # Replace multiple spaces with a single space
-    filename = re.sub(r"\s+", " ", filename)
-    # Remove extra spaces and trim.
+    filename = _PUNCTUATION_RE.sub(" ", filename)
+    # Collapse whitespace and trim.
     return " ".join(filename.split()).strip()
 
 
-def character_based_similarity(str1: str, str2: str) -> float:
-    return SequenceMatcher(None, str1, str2).ratio()
+def character_based_similarity(
+    str1: str, str2: str, score_to_beat: float = -1.0
+) -> float:
+    matcher = SequenceMatcher(None, str1, str2)
+    # Skip the expensive ratio when its cheap upper bounds can't beat the score.
+    if (
+        matcher.real_quick_ratio() <= score_to_beat
+        or matcher.quick_ratio() <= score_to_beat
+    ):
+        return 0.0
+    return matcher.ratio()
 
 
 def extract_subtitles(context: Context) -> str:
@@ -806,29 +1129,32 @@ def extract_subtitles(context: Context) -> str:
     if len(sorted_streams) == 1:
         logging.info("Using only available supported subtitle stream.")
         return extract_specific_subtitle(context, sorted_streams[0]["index"])
-    selected_stream = display_and_select_stream(sorted_streams, "subtitle")
+    selected_stream = display_and_select_stream(
+        sorted_streams,
+        "subtitle",
+        interactive=getattr(context.args, "interactive", True),
+    )
     return extract_specific_subtitle(context, int(selected_stream))
 
 
 def sort_subtitle_streams(
     streams: list[dict[str, Any]], preferred_languages: list[str] = []
 ) -> list[dict[str, Any]]:
+    preferred_languages = preferred_languages or []
+    language_priorities: dict[str, int] = {}
+    for priority, preferred_language in enumerate(preferred_languages):
+        language_priorities.setdefault(preferred_language.lower(), priority)
+    unlisted_priority = len(preferred_languages)
+
     def stream_sort_key(stream: dict[str, Any]) -> tuple[int, int, int, int, str]:
         tags = stream.get("tags", {})
         language = tags.get("language", "").lower()
         title = tags.get("title", "").lower()
-        lang_priority = (
-            (
-                preferred_languages.index(language)
-                if language in preferred_languages
-                else len(preferred_languages)
-            )
-            if preferred_languages
-            else 0
-        )
+        lang_priority = language_priorities.get(language, unlisted_priority)
         is_forced = int(tags.get("forced", "0") != "1")
         is_default = int(stream.get("disposition", {}).get("default", 0) != 1)
-        title_penalty = sum(1 for word in PENALIZED_SUBTITLE_KEYWORDS if word in title)
+        # Each keyword counts once, however often it appears.
+        title_penalty = len(set(_PENALIZED_KEYWORDS_RE.findall(title)))
         return (lang_priority, is_forced, is_default, title_penalty, title)
 
     return sorted(streams, key=stream_sort_key)
@@ -857,19 +1183,92 @@ def extract_specific_subtitle(context: Context, stream_index: int) -> str:
     return output_path
 
 
-def filter_skip_patterns_in_place(
-    subs: pysubs2.SSAFile, skip_patterns: list[re.Pattern]
+@lru_cache(maxsize=None)
+def compile_line_skip_patterns(patterns: tuple[str, ...]) -> tuple[re.Pattern, ...]:
+    compiled = tuple(re.compile(pattern) for pattern in patterns)
+    if len(compiled) < 2:
+        return compiled
+    fused = fuse_patterns(compiled)
+    return (fused,) if fused else compiled
+
+
+def fuse_patterns(patterns: Sequence[re.Pattern]) -> Optional[re.Pattern]:
+    """Combine patterns into a single alternation with equivalent `match` results.
+
+    Returns None when the patterns can't be safely combined.
+    """
+    # Combining shifts group numbers, which would break numeric backreferences.
+    if any(pattern.groups for pattern in patterns) and any(
+        _NUMERIC_GROUP_REFERENCE_RE.search(pattern.pattern) for pattern in patterns
+    ):
+        return None
+    alternatives = []
+    for pattern in patterns:
+        # Global flags are only allowed at the start, so scope them to the group.
+        body = _GLOBAL_FLAGS_RE.sub("", pattern.pattern)
+        flags = "".join(
+            letter for flag, letter in _SCOPED_FLAGS if pattern.flags & flag
+        )
+        if pattern.flags & re.VERBOSE:
+            # Keep a trailing comment from swallowing the closing parenthesis.
+            body += "\n"
+        alternatives.append(f"(?{flags}:{body})")
+    try:
+        return re.compile("|".join(alternatives))
+    except re.error:
+        return None
+
+
+def filter_events_in_place(
+    subs: pysubs2.SSAFile,
+    skip_patterns: Sequence[re.Pattern],
+    skip_intervals: list[tuple[float, float]],
 ) -> None:
-    logging.debug("Filtering subtitles based on skip patterns…")
-    subs.events = [
+    """Drop lines matching a skip pattern or overlapping a skipped chapter."""
+    matches_skip_pattern = build_skip_pattern_matcher(skip_patterns)
+    overlaps_skipped_chapter = build_chapter_overlap_checker(skip_intervals)
+    if not matches_skip_pattern and not overlaps_skipped_chapter:
+        return
+    # A single pass that reuses the events list.
+    subs.events[:] = [
         line
-        for line in subs
-        if not any(pattern.match(line.plaintext) for pattern in skip_patterns)
+        for line in subs.events
+        if not (
+            overlaps_skipped_chapter
+            and overlaps_skipped_chapter(line.start / 1000, line.end / 1000)
+        )
+        and not (matches_skip_pattern and matches_skip_pattern(get_plaintext(line)))
     ]
 
 
+def filter_skip_patterns_in_place(
+    subs: pysubs2.SSAFile, skip_patterns: Sequence[re.Pattern]
+) -> None:
+    logging.debug("Filtering subtitles based on skip patterns…")
+    filter_events_in_place(subs, skip_patterns, [])
+
+
+def build_skip_pattern_matcher(
+    skip_patterns: Sequence[re.Pattern],
+) -> Optional[Callable[[str], bool]]:
+    if not skip_patterns:
+        return None
+    if len(skip_patterns) == 1:
+        match = skip_patterns[0].match
+        return lambda text: match(text) is not None
+    return lambda text: any(pattern.match(text) for pattern in skip_patterns)
+
+
+def get_plaintext(line: pysubs2.SSAEvent) -> str:
+    text = line.text
+    # Without override tags or escapes (e.g. \N), the plain text is the text.
+    if "{" not in text and "\\" not in text:
+        return text
+    return line.plaintext
+
+
 def get_skipped_chapter_intervals(context: Context) -> list[tuple[float, float]]:
-    skip_titles = context.config.get("skip_chapters", [])
+    skip_titles = get_chapter_title_set(tuple(context.config.get("skip_chapters", [])))
     matched_chapters = [
         chapter
         for chapter in context.stream_info["chapters"]
@@ -883,43 +1282,73 @@ def get_skipped_chapter_intervals(context: Context) -> list[tuple[float, float]]
     return [(float(ch["start_time"]), float(ch["end_time"])) for ch in matched_chapters]
 
 
+@lru_cache(maxsize=None)
+def get_chapter_title_set(titles: tuple[str, ...]) -> frozenset[str]:
+    return frozenset(title.lower() for title in titles)
+
+
 def filter_chapters_in_place(
     subs: pysubs2.SSAFile,
     skip_intervals: list[tuple[float, float]],
 ) -> None:
     logging.debug("Filtering subtitles based on chapters…")
+    filter_events_in_place(subs, [], skip_intervals)
 
-    def segments_overlap(
-        sub_start: float, sub_end: float, skip: tuple[float, float]
-    ) -> bool:
-        return not (sub_end < skip[0] or sub_start > skip[1])
 
-    subs.events = [
-        line
-        for line in subs
-        if not any(
-            segments_overlap(line.start / 1000, line.end / 1000, skip)
-            for skip in skip_intervals
-        )
-    ]
+def build_chapter_overlap_checker(
+    skip_intervals: Sequence[tuple[float, float]],
+) -> Optional[Callable[[float, float], bool]]:
+    if not skip_intervals:
+        return None
+    sorted_intervals = sorted(skip_intervals)
+    starts = [start for start, _ in sorted_intervals]
+    # Latest end among intervals starting at or before each index, so that
+    # nested or overlapping chapters are handled too.
+    max_ends = list(accumulate((end for _, end in sorted_intervals), max))
+
+    def overlaps_skipped_chapter(sub_start: float, sub_end: float) -> bool:
+        index = bisect_right(starts, sub_end) - 1
+        return index >= 0 and max_ends[index] >= sub_start
+
+    return overlaps_skipped_chapter
 
 
 def extract_speech_timing_from_subtitles(
-    context: Context, subtitles: pysubs2.SSAFile
+    context: Context,
+    subtitles: pysubs2.SSAFile,
+    skip_patterns: Sequence[re.Pattern] = (),
+    skip_intervals: Sequence[tuple[float, float]] = (),
 ) -> list[tuple[float, float]]:
+    """Filter and delay the subtitles in place, returning merged speech segments.
+
+    Skipped chapters are matched against the timings before the delay.
+    """
+    matches_skip_pattern = build_skip_pattern_matcher(skip_patterns)
+    overlaps_skipped_chapter = build_chapter_overlap_checker(skip_intervals)
+    if matches_skip_pattern or overlaps_skipped_chapter:
+        logging.debug("Filtering subtitles based on skip patterns and chapters…")
     delay = context.args.sub_delay
     if delay != 0:
         logging.debug(f"Applying subtitle offset of {delay:.3f} milliseconds.")
-        subtitles.shift(ms=delay)
     padding = context.config["padding"]
+    kept_lines = []
     segments = []
-    for line in subtitles:
-        start = line.start / 1000 - padding
-        end = line.end / 1000 + padding
-        start = max(0, start)
-        end = max(0, end)
+    for line in subtitles.events:
+        if overlaps_skipped_chapter and overlaps_skipped_chapter(
+            line.start / 1000, line.end / 1000
+        ):
+            continue
+        if matches_skip_pattern and matches_skip_pattern(get_plaintext(line)):
+            continue
+        if delay:
+            line.start += delay
+            line.end += delay
+        kept_lines.append(line)
+        start = max(0, line.start / 1000 - padding)
+        end = max(0, line.end / 1000 + padding)
         if end > start:  # Only add segments with positive duration.
             segments.append((start, end))
+    subtitles.events[:] = kept_lines
     merged_segments = merge_overlapping_segments(segments)
     if INCLUDE_DEMO_UTILS:
         save_segments_as_json(context, merged_segments)  # type: ignore  # pragma: no cover
@@ -932,15 +1361,19 @@ def merge_overlapping_segments(
 ) -> list[tuple[float, float]]:
     if not segments:
         return []
-    segments.sort(key=lambda x: x[0])  # Sort by start time.
-    merged = [segments[0]]
-    for current in segments[1:]:
-        previous = merged[-1]
-        if current[0] <= previous[1]:
+    segments.sort(key=itemgetter(0))  # Sort by start time.
+    merged = []
+    remaining = iter(segments)
+    merged_start, merged_end = next(remaining)
+    for start, end in remaining:
+        if start <= merged_end:
             # Merge overlapping segments.
-            merged[-1] = (previous[0], max(previous[1], current[1]))
+            if end > merged_end:
+                merged_end = end
         else:
-            merged.append(current)
+            merged.append((merged_start, merged_end))
+            merged_start, merged_end = start, end
+    merged.append((merged_start, merged_end))
     return merged
 
 
@@ -949,38 +1382,154 @@ def generate_output_path(context: Context, extension: str) -> str:
         filename = context.clean_name
     else:
         filename = context.input_name
-    file_path = context.file_path
     suffix = context.config.get("output_suffix")
     filename = f"{filename}{suffix}.{extension}"
+    return str(get_output_directory(context) / filename)
+
+
+def get_output_directory(context: Context) -> Path:
+    # Resolved and created once per file, however many outputs it has.
+    if context.output_directory is not None:
+        return context.output_directory
     if context.args.output:
         output_dir = Path(os.path.expanduser(context.args.output))
     elif context.config.get("output_directory"):
         output_dir = Path(os.path.expanduser(context.config["output_directory"]))
     else:
-        output_dir = Path(file_path).parent
+        output_dir = Path(context.file_path).parent
     output_dir.mkdir(parents=True, exist_ok=True)
-    return str(output_dir / filename)
+    context.output_directory = output_dir
+    return output_dir
 
 
 def get_audio_extension(context: Context) -> str:
+    if context.audio_extension is None:
+        context.audio_extension = resolve_audio_extension(context)
+    return context.audio_extension
+
+
+def resolve_audio_extension(context: Context) -> str:
     logging.debug("Getting audio extension…")
     audio_codec = context.config["condensed_audio.audio_codec"]
     if audio_codec == "copy" and context.selected_audio_stream is not None:
-        try:
-            # ffmpeg uses 1-based indexing for streams.
-            stream_index = int(context.selected_audio_stream) - 1
-            original_codec = (
-                context.stream_info["audio"][stream_index].get("codec_name", "").lower()
-            )
-            logging.debug(f"The original codec is: {original_codec}")
-            return get_extension_for_codec(original_codec)
-        except (IndexError, ValueError) as e:
-            logging.error(f"Error accessing audio stream info: {e}")
-            return get_extension_for_codec(audio_codec)
+        return get_extension_for_codec(get_original_audio_codec(context))
     return get_extension_for_codec(audio_codec)
 
 
+def get_original_audio_codec(context: Context) -> str:
+    if context.original_audio_codec is None:
+        context.original_audio_codec = resolve_original_audio_codec(context)
+    return context.original_audio_codec
+
+
+def resolve_original_audio_codec(context: Context) -> str:
+    # The selected stream is ffprobe's global index, not a position in the list.
+    stream = next(
+        (
+            stream
+            for stream in context.stream_info["audio"]
+            if str(stream["index"]) == context.selected_audio_stream
+        ),
+        {},
+    )
+    original_codec: str = stream.get("codec_name", "").lower()
+    logging.debug(f"The original codec is: {original_codec}")
+    return original_codec
+
+
+def load_subtitles(context: Context, subtitle_path: str) -> pysubs2.SSAFile:
+    # Subtitles extracted to the temporary directory are never reused.
+    is_extracted = Path(subtitle_path).is_relative_to(context.temp_dir)
+    if is_extracted:
+        # We named the file after its format; skip autodetection, which
+        # buffers and copies the whole file first.
+        format_identifier = Path(subtitle_path).suffix[1:]
+        if format_identifier in SUPPORTED_SUBTITLE_FORMATS:
+            return pysubs2.load(subtitle_path, format_=format_identifier)
+        return pysubs2.load(subtitle_path)
+    if getattr(context.args, "no_cache", False):
+        return pysubs2.load(subtitle_path)
+    real_path = os.path.realpath(subtitle_path)
+    cache_path = get_subtitle_cache_path(real_path)
+    fingerprint = get_subtitle_fingerprint(real_path)
+    # Unpickling runs code, but the cache lives in the user's own cache
+    # directory (not a shared one), which we trust like shuku's own files.
+    try:
+        with open(cache_path, "rb") as f:
+            cached_fingerprint, cached = pickle.load(f)
+        if cached_fingerprint == fingerprint and isinstance(cached, pysubs2.SSAFile):
+            logging.debug(f"Loaded cached subtitles: {cache_path}")
+            return cached
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.debug(f"Ignoring unreadable subtitle cache {cache_path}: {e}")
+    subtitles = pysubs2.load(subtitle_path)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so parallel jobs never read a partial file.
+        # One file per subtitle path: a changed file overwrites its old entry.
+        temp_cache_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_cache_path, "wb") as f:
+            pickle.dump((fingerprint, subtitles), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_cache_path, cache_path)
+        prune_subtitle_cache(cache_path.parent)
+    except OSError as e:
+        logging.debug(f"Could not cache subtitles: {e}")
+    return subtitles
+
+
+def get_subtitle_cache_path(real_path: str) -> Path:
+    # Versions are part of the name so an upgrade never loads a stale pickle;
+    # pruning clears the entries left behind.
+    key = f"{real_path}|{VERSION}|{version('pysubs2')}"
+    cache_key = hashlib.sha1(key.encode()).hexdigest()
+    return get_cache_directory() / "subtitles" / f"{cache_key}.pickle"
+
+
+def get_subtitle_fingerprint(real_path: str) -> tuple[int, int]:
+    stat = os.stat(real_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def prune_subtitle_cache(cache_directory: Path) -> None:
+    """Delete cache files past the maximum age, then the oldest past the size cap."""
+    expiry = time.time() - SUBTITLE_CACHE_MAX_AGE_SECONDS
+    entries = []
+    with os.scandir(cache_directory) as scanned:
+        for entry in scanned:
+            try:
+                modified = entry.stat().st_mtime
+                if modified < expiry:
+                    os.remove(entry.path)
+                elif entry.name.endswith(".pickle"):
+                    entries.append((modified, entry.path))
+            except FileNotFoundError:
+                pass  # Removed by a parallel job.
+    entries.sort()
+    for _, path in entries[: max(0, len(entries) - SUBTITLE_CACHE_MAX_ENTRIES)]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def get_cache_directory() -> Path:
+    if platform.system() == "Windows":
+        cache_base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    else:
+        # Unix-like systems (GNU+Linux, macOS).
+        cache_base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(cache_base) / PROGRAM_NAME
+
+
 def get_subtitle_extension(context: Context) -> str:
+    if context.subtitle_extension is None:
+        context.subtitle_extension = resolve_subtitle_extension(context)
+    return context.subtitle_extension
+
+
+def resolve_subtitle_extension(context: Context) -> str:
     if context.config["condensed_subtitles.format"] != "auto":
         format = context.config["condensed_subtitles.format"]
         logging.debug(f"Using user-specified format: {format}")
@@ -995,14 +1544,63 @@ def get_subtitle_extension(context: Context) -> str:
 
 
 def get_extension_for_codec(codec: str) -> str:
-    return {
-        "aac": "m4a",
-        "alac": "m4a",
-        "flac": "flac",
-        "libmp3lame": "mp3",
-        "libopus": "ogg",
-        "pcm_s16le": "wav",
-    }.get(codec.lower(), "mkv")
+    return AUDIO_CODEC_EXTENSIONS.get(codec.lower(), "mkv")
+
+
+def can_select_audio_in_single_pass(context: Context) -> bool:
+    config = context.config
+    if not config["condensed_audio.enabled"]:
+        return False
+    if config["condensed_audio.audio_codec"] == "copy":
+        return False  # Filtering requires re-encoding.
+    custom_args = config.get("condensed_audio.custom_ffmpeg_args") or {}
+    return AUDIO_FILTER_OPTIONS.isdisjoint(custom_args)
+
+
+def create_condensed_audio_from_source(
+    context: Context,
+    segments: list[tuple[float, float]],
+) -> None:
+    audio_extension = get_audio_extension(context)
+    logging.debug(f"Using audio extension: {audio_extension}")
+    temp_path = os.path.join(context.temp_dir, f"temp.{audio_extension}")
+    logging.debug(f"Selecting {len(segments)} segments in a single pass…")
+    filter_script = create_audio_select_filter_script(segments, context.temp_dir)
+    encode_selected_audio(context, filter_script, temp_path)
+    suggested_path = generate_output_path(context, audio_extension)
+    final_path = safe_move(context, temp_path, suggested_path)
+    if final_path:
+        logging.success(f"Condensed audio created successfully: '{final_path}'")  # type: ignore
+
+
+def create_audio_select_filter_script(
+    segments: list[tuple[float, float]], temp_dir: str
+) -> str:
+    # Written to a file, as the expression can exceed command line length limits.
+    filter_script = os.path.join(temp_dir, "audio_filter.txt")
+    expression = get_select_expression(segments)
+    with open(filter_script, "w") as f:
+        f.write(f"aselect='{expression}',asetpts=N/SR/TB")
+    return filter_script
+
+
+def get_select_expression(segments: list[tuple[float, float]]) -> str:
+    return "+".join(f"between(t,{start:.3f},{end:.3f})" for start, end in segments)
+
+
+def encode_selected_audio(
+    context: Context, filter_script: str, output_path: str
+) -> None:
+    ffmpeg = FFmpeg().option("y").input(context.file_path)
+    # Chapters from the source would no longer line up with the condensed audio.
+    ffmpeg_options = {"filter_script:a": filter_script, "map_chapters": "-1"}
+    encode_audio(
+        context,
+        ffmpeg,
+        f"0:{context.selected_audio_stream}",
+        ffmpeg_options,
+        output_path,
+    )
 
 
 def create_condensed_audio(
@@ -1029,30 +1627,49 @@ def extract_segments(
     file_path = context.file_path
     video_stream_index = None
     if context.config["condensed_video.enabled"]:
-        video_stream = next((s for s in context.stream_info["video"]), None)
-        if not video_stream:
-            raise FileProcessingError(file_path, "No video stream found")
-        video_stream_index = video_stream["index"]
-    segment_files: list[str] = []
+        video_stream_index = get_video_stream_index(context)
+    segment_files = [
+        str(Path(context.temp_dir) / f"segment_{i}.mkv") for i in range(len(segments))
+    ]
     progress_bar = custom_progress_bar(len(segments))
-    for i, (start, end) in enumerate(segments):
-        segment_file = Path(context.temp_dir) / f"segment_{i}.mkv"
-        segment_files.append(str(segment_file))
-        extract_segment(
-            file_path,
-            str(segment_file),
-            start,
-            end,
-            str(context.selected_audio_stream),
-            video_stream_index,
-        )
-        if progress_bar:
-            progress_bar.update(1)
-    if progress_bar:
-        progress_bar.close()
+    # Each segment is extracted by its own ffmpeg process, so threads suffice.
+    workers = (
+        context.config.get("segment_extraction_workers") or SEGMENT_EXTRACTION_WORKERS
+    )
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                extract_segment,
+                file_path,
+                segment_file,
+                start,
+                end,
+                str(context.selected_audio_stream),
+                video_stream_index,
+            )
+            for segment_file, (start, end) in zip(segment_files, segments)
+        ]
+        try:
+            for future in as_completed(futures):
+                future.result()
+                if progress_bar:
+                    progress_bar.update(1)
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+        finally:
+            if progress_bar:
+                progress_bar.close()
     return segment_files
 
 
+def get_video_stream_index(context: Context) -> int:
+    video_stream = next((s for s in context.stream_info["video"]), None)
+    if not video_stream:
+        raise FileProcessingError(context.file_path, "No video stream found")
+    return int(video_stream["index"])
+
+
 def extract_segment(
     file_path: str,
     output_path: str,
@@ -1080,18 +1697,47 @@ def extract_segment(
 def create_concat_file(segment_files: list[str], temp_dir: str) -> str:
     concat_file = os.path.join(temp_dir, "concat.txt")
     with open(concat_file, "w") as f:
-        for segment_file in segment_files:
-            f.write(f"file '{segment_file}'\n")
+        f.write("".join(f"file '{segment_file}'\n" for segment_file in segment_files))
     return concat_file
 
 
 def encode_final_audio(context: Context, concat_file: str, output_path: str) -> None:
+    ffmpeg = (
+        FFmpeg().option("y").input(**get_concat_input_options(context, concat_file))
+    )
+    encode_audio(context, ffmpeg, "0:a", {}, output_path)
+
+
+def get_concat_input_options(context: Context, concat_file: str) -> dict[str, Any]:
+    return {
+        "url": concat_file,
+        "f": "concat",
+        "safe": 0,
+        # Read the concat list front to back; seeking makes some ffmpeg versions
+        # rescan it from the start.
+        "seekable": 0,
+        "thread_queue_size": context.config.get("thread_queue_size", 1024),
+    }
+
+
+def encode_audio(
+    context: Context,
+    ffmpeg: FFmpeg,
+    audio_map: str,
+    extra_options: dict[str, Any],
+    output_path: str,
+) -> None:
     ffmpeg_audio_options = get_ffmpeg_audio_options(context, media_type="audio")
     custom_args = context.config.get("condensed_audio.custom_ffmpeg_args") or {}
-    ffmpeg_options = ffmpeg_audio_options | custom_args | context.metadata
+    ffmpeg_options = (
+        extra_options
+        | get_ffmpeg_thread_options(context)
+        | ffmpeg_audio_options
+        | custom_args
+        | context.metadata
+    )
     audio_codec = context.config["condensed_audio.audio_codec"]
-    ffmpeg = FFmpeg().option("y").input(concat_file, f="concat", safe=0)
-    maps = ["0:a"]
+    maps = [audio_map]
     if context.cover_image_path and audio_codec not in COVER_ART_UNSUPPORTED_CODECS:
         ffmpeg = ffmpeg.input(context.cover_image_path)
         maps.append("1:v")
@@ -1106,6 +1752,14 @@ def encode_final_audio(context: Context, concat_file: str, output_path: str) ->
     ffmpeg.execute()
 
 
+def get_ffmpeg_thread_options(context: Context) -> dict[str, Any]:
+    jobs = getattr(context.args, "jobs", 1)
+    if jobs <= 1:
+        return {}  # Let ffmpeg pick.
+    # Files encoding in parallel share the CPU instead of each claiming all of it.
+    return {"threads": max(1, CPU_COUNT // jobs)}
+
+
 def get_ffmpeg_audio_options(
     context: Context,
     media_type: Literal["audio", "video"] = "audio",
@@ -1159,82 +1813,120 @@ def is_hdr_video(stream_info: dict[str, Any]) -> bool:
     return color_transfer in ("smpte2084", "arib-std-b67")
 
 
+@lru_cache(maxsize=2048)
 def prepare_filename_for_display(filename: str) -> str:
     # Clean stuff that might be helpful for matching subs to files, but irrelevant for display.
     # Source.
-    filename = re.sub(
-        r"\b(DV|Blu(-| )?Ray|NF|REMASTERED|HMAX|AMZN|DSNP|SESO|ATVP|HULU|WEB(-| )?(DL|RIP)?|DVDRip|BDRip)\b",
-        "",
-        filename,
-        flags=re.IGNORECASE,
-    )
+    filename = _SOURCE_RE.sub("", filename)
     # 🦜🏴‍☠️
-    filename = re.sub(
-        r"[-.](?=[^.]*\.(?:[a-zA-Z]{2,4})$)(?:[A-Z0-9]{2,}|(?:(?=[a-z]*[A-Z][a-z]*[A-Z])|(?=[A-Z]*[a-z][A-Z]*))(?=.*[A-Z])(?=.*[a-z])[A-Za-z0-9-]{2,}|[A-Za-z0-9]{2,5})(?=[.-]?\w+$)",
-        "",
-        filename,
-    )
-    filename = re.sub(r"([A-Z]+|(?=.*[A-Z]){2,4})(?=\.[a-zA-Z]{2,4}$)", "", filename)
+    filename = strip_release_tags(filename)
     # Other stuff.
-    filename = re.sub(
-        r"\b(_-_|DoVi|E\.N\.D|DVD|PAL|CR|FUNI|U-NEXT|Dual[\. ]Audio|PROPER|JPN\+?ENG|JAP|GBR|ENG|JAPANESE|JPN|SUBBED|DUAL|Remaster|MA\.5\.1)\b",
-        "",
-        filename,
-        flags=re.IGNORECASE,
-    )
+    filename = _OTHER_TAGS_RE.sub("", filename)
     filename = clean_filename(filename)
     # Wrap the year in parentheses, if present.
-    END_YEAR_PATTERN = YEAR_PATTERN + r"\s*$"
-    filename = re.sub(END_YEAR_PATTERN, r"(\1)", filename)
+    filename = _END_YEAR_RE.sub(r"(\1)", filename)
     return filename
 
 
+def strip_release_tags(filename: str) -> str:
+    """Drop a release group tag (e.g. "-NTb", ".FLUX") right before the extension,
+    then any run of capitals left in its place.
+
+    A single pass over the filename, so odd names can't trigger regex backtracking.
+    """
+    stem, dot, extension = filename.rpartition(".")
+    if not dot or not (
+        2 <= len(extension) <= 4 and extension.isascii() and extension.isalpha()
+    ):
+        return filename
+    # Tags are letters, digits and dashes, so they live in the trailing run of those.
+    tag_start = len(stem)
+    last_upper = last_lower = last_dash = -1
+    while tag_start > 0 and stem[tag_start - 1] in _RELEASE_GROUP_CHARS:
+        tag_start -= 1
+        char = stem[tag_start]
+        if char == "-":
+            last_dash = max(last_dash, tag_start)
+        elif char.isupper():
+            last_upper = max(last_upper, tag_start)
+        elif char.islower():
+            last_lower = max(last_lower, tag_start)
+    extension_has_upper = not extension.islower()
+    extension_has_lower = not extension.isupper()
+    separators = [i for i in range(tag_start, len(stem)) if stem[i] == "-"]
+    if tag_start and stem[tag_start - 1] == ".":
+        separators.insert(0, tag_start - 1)
+    for separator in separators:
+        if len(stem) - separator <= 2:
+            break
+        if separator >= last_dash and (
+            last_lower <= separator or len(stem) - separator <= 6
+        ):
+            # All caps (e.g. "FLUX") or short (e.g. "ABc") tags.
+            stem = stem[:separator]
+            break
+        tag_position = separator + 1
+        # Longer mixed-case tags, like "SkipTheTalk".
+        if (
+            _TWO_CAPITALS_RE.match(stem, tag_position)
+            or _LEADING_LOWERCASE_RE.match(stem, tag_position)
+        ) and (
+            (extension_has_upper or last_upper > separator)
+            and (extension_has_lower or last_lower > separator)
+        ):
+            stem = stem[:separator]
+            break
+    return stem.rstrip(string.ascii_uppercase) + dot + extension
+
+
 def extract_season_and_episode(filename: str, directory_name: str) -> tuple[str, str]:
     logging.debug("Extracting season and episode numbers…")
-    season_patterns = [
-        r"\bS(\d+)(?=E\d+\b)",  # SxxExx.
-        r"\bS(\d+)\b",  # Sxx.
-        r"Season\s*(\d+)",  # "Season x".
-        r"_S(\d+)_",  # _Sxx_.
-        r"第(\d+)季",  # Japanese season format.
-    ]
-    episode_patterns = [
-        r"\bE(\d+)\b",  # Standard (E01).
-        r"Ep?\.?\s*(\d+)\b",  # Ep01, Ep.01, E.01.
-        r"[_\s]-\s*(\d+)(?:v\d+)?",  # " - 01" or " - 01v2" format. Allows underscore before hyphen.
-        r"[_\s](\d+)(?:v\d+)?(?=[_\s]|$|\(|\[)",  # Standalone number, possibly followed by version (v2, v3, etc.), allowing underscore.
-        r"\[(\d+)(?:v\d+)?\]",  # [01] or [01v2].
-        r"第(\d+)[話话]",  # Japanese episode format.
-        r"#(\d+)",  # #01 format.
-    ]
     logging.debug(f"Filename: {filename}")
     logging.debug(f"Directory name: {directory_name}")
     season = (
-        find_match(season_patterns, filename)
-        or find_match(season_patterns, directory_name)
+        find_match(_SEASON_RE, SEASON_PATTERNS, filename)
+        or find_match(_SEASON_RE, SEASON_PATTERNS, directory_name)
         or "01"
     )
     episode = (
-        find_match(episode_patterns, filename)
-        or find_match(episode_patterns, directory_name)
+        find_match(_EPISODE_RE, EPISODE_PATTERNS, filename)
+        or find_match(_EPISODE_RE, EPISODE_PATTERNS, directory_name)
         or "01"
     )
     logging.debug(f"Season: {season}, Episode: {episode}")
     return season, episode
 
 
-def find_match(patterns: list[str], text: str) -> Optional[str]:
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            result = match.group(1).zfill(2)
-            logging.debug(f"Match found: {result} (pattern: {pattern})")
-            return result
+def find_match(
+    combined_pattern: re.Pattern[str], patterns: Sequence[str], text: str
+) -> Optional[str]:
+    # Every pattern captures a number, so skip names without digits (e.g. movies).
+    if not _DIGIT_RE.search(text):
+        return None
+    match = combined_pattern.match(text)
+    if match and match.lastindex:
+        # Each pattern has a single group, so the group number is the pattern's.
+        result = match.group(match.lastindex).zfill(2)
+        logging.debug(
+            f"Match found: {result} (pattern: {patterns[match.lastindex - 1]})"
+        )
+        return result
     return None
 
 
+def combine_patterns_by_priority(patterns: Sequence[str]) -> re.Pattern[str]:
+    # Each pattern sits in a lookahead anchored at the start, so the first pattern
+    # that matches anywhere wins, as if searching for each one in turn.
+    alternatives = "|".join(f"(?=.*?{pattern})" for pattern in patterns)
+    return re.compile(f"^(?:{alternatives})", re.IGNORECASE | re.DOTALL)
+
+
+_SEASON_RE = combine_patterns_by_priority(SEASON_PATTERNS)
+_EPISODE_RE = combine_patterns_by_priority(EPISODE_PATTERNS)
+
+
 def get_destination_path(context: Context, final_path: str) -> Optional[str]:
-    if not os.path.exists(final_path):
+    if reserve_path(final_path):
         return final_path
     if_file_exists = context.config["if_file_exists"]
     if if_file_exists == "skip":
@@ -1254,17 +1946,39 @@ def get_destination_path(context: Context, final_path: str) -> Optional[str]:
         base, ext = os.path.splitext(final_path)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         final_path = f"{base}_{timestamp}{ext}"
+        # Renames within the same second would otherwise replace each other.
+        suffix = count(1)
+        while not reserve_path(final_path):
+            final_path = f"{base}_{timestamp}_{next(suffix)}{ext}"
         logging.info(f"Renaming file to: '{final_path}'")
     else:  # overwrite.
         logging.info(f"Overwriting existing file: '{final_path}'")
     return final_path
 
 
+def reserve_path(path: str) -> bool:
+    """Create an empty placeholder at path, unless something is already there.
+
+    Creating it atomically stops parallel jobs from claiming the same name.
+    """
+    try:
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        return False
+    return True
+
+
 def safe_move(context: Context, temp_path: str, final_path: str) -> str:
     destination = get_destination_path(context, final_path)
     if destination is None:
         return ""
-    shutil.move(temp_path, destination)
+    try:
+        # A single atomic rename when the temporary directory shares the filesystem.
+        os.replace(temp_path, destination)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(temp_path, destination)
     return destination
 
 
@@ -1280,38 +1994,46 @@ def create_condensed_subtitles(
     progress_bar = custom_progress_bar(len(speech_segments))
     # Pre-calculate subtitle start times in milliseconds.
     sub_starts = [sub.start for sub in subs]
-    condensed_subs_batch = []
-    for segment_start, segment_end in speech_segments:
-        segment_start = int(segment_start * 1000)
-        segment_end_ms = int(segment_end * 1000)
-        segment_duration = segment_end_ms - segment_start
-        # Find the index of the first subtitle that starts within this segment.
-        start_index = bisect_left(sub_starts, segment_start)
-        for sub in subs[start_index:]:
-            if sub.start >= segment_end_ms:
-                break
-            new_sub = pysubs2.SSAEvent()
-            new_sub.start = sub.start - segment_start + cumulative_duration
-            new_sub.end = min(
-                sub.end - segment_start + cumulative_duration,
-                segment_duration + cumulative_duration,
-            )
+    sub_count = len(sub_starts)
+    events = subs.events
+    SSAEvent = pysubs2.SSAEvent
+    append = condensed_subs.events.append
+    segments_ms = [
+        (int(start * 1000), int(end * 1000)) for start, end in speech_segments
+    ]
+    # Segments are sorted and don't overlap, so one forward pass over the
+    # subtitles assigns each line to its segment (a sorted interval join).
+    index = 0
+    for segment_start_ms, segment_end_ms in segments_ms:
+        segment_duration = segment_end_ms - segment_start_ms
+        offset = cumulative_duration - segment_start_ms
+        condensed_segment_end = cumulative_duration + segment_duration
+        # Skip to the first subtitle that starts within this segment.
+        index = bisect_left(sub_starts, segment_start_ms, index)
+        while index < sub_count and sub_starts[index] < segment_end_ms:
+            sub = events[index]
+            new_sub = SSAEvent()
+            new_sub.start = sub.start + offset
+            new_sub.end = min(sub.end + offset, condensed_segment_end)
             new_sub.text = sub.text
-            condensed_subs_batch.append(new_sub)
+            append(new_sub)
+            index += 1
         cumulative_duration += segment_duration
         if progress_bar:
             progress_bar.update(1)
     if progress_bar:
         progress_bar.close()
-    condensed_subs.events.extend(condensed_subs_batch)
     subtitle_extension = get_subtitle_extension(context)
     temp_path = os.path.join(context.temp_dir, f"temp.{subtitle_extension}")
-    if subtitle_extension == "lrc":
-        lrc_content = convert_to_lrc(condensed_subs, context.clean_name)
-        with open(temp_path, "w", encoding="utf-8") as f:
-            f.write(lrc_content)
-    else:
-        condensed_subs.save(temp_path)
+    # Subtitles are written line by line; a larger buffer means fewer system calls.
+    with open(
+        temp_path, "w", encoding="utf-8", buffering=SUBTITLE_WRITE_BUFFER_SIZE
+    ) as f:
+        if subtitle_extension == "lrc":
+            write_lrc(f, condensed_subs, context.clean_name)
+        else:
+            subtitle_format = get_format_identifier(f".{subtitle_extension}")
+            condensed_subs.to_file(f, subtitle_format)
     suggested_path = generate_output_path(context, subtitle_extension)
     final_path = safe_move(context, temp_path, suggested_path)
     if final_path:
@@ -1319,31 +2041,107 @@ def create_condensed_subtitles(
 
 
 def convert_to_lrc(subs: pysubs2.SSAFile, clean_name: str) -> str:
+    buffer = io.StringIO()
+    write_lrc(buffer, subs, clean_name)
+    return buffer.getvalue()
+
+
+def write_lrc(f: TextIO, subs: pysubs2.SSAFile, clean_name: str) -> None:
     # Start the LRC file with metadata.
-    lrc_lines = [
-        f"[ti:{clean_name}]",
-        f"[tool:{PROGRAM_NAME}]",
-        f"[ve:{VERSION}]",
-        f"[by:{REPOSITORY}]",
-        "",
-    ]
+    f.write(
+        f"[ti:{clean_name}]\n"
+        f"[tool:{PROGRAM_NAME}]\n"
+        f"[ve:{VERSION}]\n"
+        f"[by:{REPOSITORY}]\n"
+        "\n"
+    )
+    # Stream lines to the file instead of building the whole document first.
+    write = f.write
     for sub in subs:
         sub.text = strip_subtitle_styles(sub.text)
-        start_time = sub.start / 1000  # Milliseconds to seconds.
-        minutes, seconds = divmod(start_time, 60)
-        # The LRC format does not support hours.
-        lrc_time = f"[{int(minutes):02d}:{seconds:05.2f}]"
-        lrc_lines.append(f"{lrc_time}{sub.text}")
-    return "\n".join(lrc_lines) + "\n"
+        # Milliseconds to minutes and seconds; the LRC format does not support hours.
+        minutes, seconds = divmod(sub.start / 1000, 60)
+        write(f"[{int(minutes):02d}:{seconds:05.2f}]{sub.text}\n")
 
 
 def strip_subtitle_styles(text: str) -> str:
-    stripped_text = "".join(fragment for fragment, _ in parse_tags(text))
-    # Replace line breaks with a space.
-    stripped_text = stripped_text.replace("\\N", " ")
-    # Ensure there's no double spaces.
-    stripped_text = " ".join(stripped_text.split())
-    return stripped_text
+    # Drop override blocks; parse_tags would also compute styles we don't use.
+    if "{" in text:
+        text = pysubs2.SSAEvent.OVERRIDE_SEQUENCE.sub("", text)
+    # Replace line breaks with a space and ensure there's no double spaces.
+    return " ".join(text.replace("\\N", " ").split())
+
+
+def can_select_video_in_single_pass(context: Context) -> bool:
+    config = context.config
+    if not config["condensed_video.enabled"]:
+        return False
+    codecs = (
+        config["condensed_video.video_codec"],
+        config["condensed_video.audio_codec"],
+    )
+    if "copy" in codecs:
+        return False  # Filtering requires re-encoding.
+    if get_constant_frame_rate(context) is None:
+        return False  # Retiming selected frames needs a known, constant rate.
+    custom_args = config.get("condensed_video.custom_ffmpeg_args") or {}
+    return VIDEO_FILTER_OPTIONS.isdisjoint(custom_args)
+
+
+def get_constant_frame_rate(context: Context) -> Optional[str]:
+    """Return the video's frame rate as a fraction string, or None if it's variable."""
+    video_stream = next(iter(context.stream_info.get("video", [])), None)
+    if not video_stream:
+        return None
+    average_rate = video_stream.get("avg_frame_rate", "0/0")
+    base_rate = video_stream.get("r_frame_rate", "0/0")
+    try:
+        if Fraction(average_rate) != Fraction(base_rate) or Fraction(average_rate) <= 0:
+            return None
+    except (ValueError, ZeroDivisionError):
+        return None
+    return str(average_rate)
+
+
+def create_condensed_video_from_source(
+    context: Context,
+    segments: list[tuple[float, float]],
+) -> None:
+    logging.debug("Preparing to create condensed video…")
+    video_extension = get_video_extension(context)
+    temp_output_path = os.path.join(context.temp_dir, f"temp.{video_extension}")
+    logging.debug(f"Selecting {len(segments)} segments in a single pass…")
+    filter_script = create_video_select_filter_script(context, segments)
+    ffmpeg = FFmpeg().option("y").input(context.file_path)
+    ffmpeg_options = {
+        "filter_complex_script": filter_script,
+        # Chapters from the source would no longer line up with the condensed video.
+        "map_chapters": "-1",
+        # Without it the muxer can't tell the rate of the filtered frames and
+        # falls back to 25 fps, dropping frames from faster sources.
+        "r": get_constant_frame_rate(context),
+    }
+    encode_video(context, ffmpeg, ["[v]", "[a]"], ffmpeg_options, temp_output_path)
+    suggested_path = generate_output_path(context, video_extension)
+    final_path = safe_move(context, temp_output_path, suggested_path)
+    if final_path:
+        logging.success(f"Condensed video created successfully: '{final_path}'")  # type: ignore
+
+
+def create_video_select_filter_script(
+    context: Context, segments: list[tuple[float, float]]
+) -> str:
+    filter_script = os.path.join(context.temp_dir, "video_filter.txt")
+    expression = get_select_expression(segments)
+    video_input = f"[0:{get_video_stream_index(context)}]"
+    audio_input = f"[0:{context.selected_audio_stream}]"
+    frame_rate = get_constant_frame_rate(context)
+    with open(filter_script, "w") as f:
+        f.write(
+            f"{video_input}select='{expression}',setpts=N/({frame_rate})/TB[v];"
+            f"{audio_input}aselect='{expression}',asetpts=N/SR/TB[a]"
+        )
+    return filter_script
 
 
 def create_condensed_video(
@@ -1354,52 +2152,53 @@ def create_condensed_video(
     video_extension = get_video_extension(context)
     temp_output_path = os.path.join(context.temp_dir, f"temp.{video_extension}")
     concat_file = create_concat_file(segment_files, context.temp_dir)
-    video_options = get_ffmpeg_video_options(context)
-    audio_options = get_ffmpeg_audio_options(context, media_type="video")
-    custom_args = context.config.get("condensed_video.custom_ffmpeg_args") or {}
-    ffmpeg_options = video_options | audio_options | custom_args | context.metadata
-    logging.debug(f"ffmpeg options: {ffmpeg_options}")
     ffmpeg = (
-        FFmpeg()
-        .option("y")
-        .input(concat_file, f="concat", safe=0)
-        .output(
-            url=temp_output_path,
-            map=["0:v", "0:a"],
-            **ffmpeg_options,
-        )
+        FFmpeg().option("y").input(**get_concat_input_options(context, concat_file))
     )
-    logging.info("Creating condensed video…")
-    ffmpeg.execute()
+    encode_video(context, ffmpeg, ["0:v", "0:a"], {}, temp_output_path)
     suggested_path = generate_output_path(context, video_extension)
     final_path = safe_move(context, temp_output_path, suggested_path)
     if final_path:
         logging.success(f"Condensed video created successfully: '{final_path}'")  # type: ignore
 
 
+def encode_video(
+    context: Context,
+    ffmpeg: FFmpeg,
+    maps: list[str],
+    extra_options: dict[str, Any],
+    output_path: str,
+) -> None:
+    video_options = get_ffmpeg_video_options(context)
+    audio_options = get_ffmpeg_audio_options(context, media_type="video")
+    custom_args = context.config.get("condensed_video.custom_ffmpeg_args") or {}
+    ffmpeg_options = (
+        extra_options
+        | get_ffmpeg_thread_options(context)
+        | video_options
+        | audio_options
+        | custom_args
+        | context.metadata
+    )
+    logging.debug(f"ffmpeg options: {ffmpeg_options}")
+    ffmpeg = ffmpeg.output(url=output_path, map=maps, **ffmpeg_options)
+    logging.info("Creating condensed video…")
+    ffmpeg.execute()
+
+
 def get_video_extension(context: Context) -> str:
+    if context.video_extension is None:
+        context.video_extension = resolve_video_extension(context)
+    return context.video_extension
+
+
+def resolve_video_extension(context: Context) -> str:
     video_codec = context.config["condensed_video.video_codec"]
-    codec_to_extension = {
-        "libx264": "mp4",
-        "h264": "mp4",
-        "libx265": "mp4",
-        "hevc": "mp4",
-        "libvpx": "webm",
-        "vp8": "webm",
-        "libvpx-vp9": "webm",
-        "vp9": "webm",
-        "libaom-av1": "mp4",
-        "av1": "mp4",
-        "mpeg4": "mp4",
-        "libxvid": "avi",
-        "msmpeg4": "avi",
-        "flv": "flv",
-        "wmv2": "wmv",
-        "mjpeg": "avi",
+    if video_codec == "copy":
         # Original extension for copy.
-        "copy": os.path.splitext(context.file_path)[1][1:],
-    }
-    extension = codec_to_extension.get(video_codec, "mkv")
+        extension = os.path.splitext(context.file_path)[1][1:]
+    else:
+        extension = VIDEO_CODEC_EXTENSIONS.get(video_codec, "mkv")
     logging.debug(f"Selected video codec: {video_codec}, using extension: {extension}")
     return extension
 
@@ -1419,39 +2218,60 @@ def get_ffmpeg_video_options(context: Context) -> dict[str, Any]:
 
 
 class ProgressBar:
+    # Updates between terminal size checks, in case the window is resized.
+    width_refresh_interval = 64
+
     def __init__(self, total: int):
         self.total = total
         self.current = 0
         self.max_width = 100
         self.min_bar_length = 10
+        self.available_width = self._get_available_width()
+        self.updates = 0
+        self.last_drawn: Optional[tuple[str, int]] = None
 
-    def _get_progress_bar(self) -> str:
-        available_width = min(
-            shutil.get_terminal_size((80, 20)).columns, self.max_width
-        )
+    def _get_available_width(self) -> int:
+        return min(shutil.get_terminal_size((80, 20)).columns, self.max_width)
+
+    def _get_progress_bar(self) -> tuple[str, tuple[str, int]]:
         count_display = f"{self.current}/{self.total}"
         percentage = f"{(self.current / self.total * 100):3.0f}%"
 
         # Bar space = total - static elements (percentage, count, borders, spaces).
         bar_length = max(
-            available_width - len(percentage) - len(count_display) - 5,
+            self.available_width - len(percentage) - len(count_display) - 5,
             self.min_bar_length,
         )
         filled = int(bar_length * self.current / self.total)
 
-        return f"\r{percentage} |{'█' * filled}{' ' * (bar_length - filled)}| {count_display}"
+        bar = f"\r{percentage} |{'█' * filled}{' ' * (bar_length - filled)}| {count_display}"
+        return bar, (percentage, filled)
 
     def update(self, n: int = 1) -> None:
         self.current += n
-        print(self._get_progress_bar(), end="", flush=True)
+        self.updates += 1
+        if self.updates % self.width_refresh_interval == 0:
+            self.available_width = self._get_available_width()
+        bar, drawn = self._get_progress_bar()
+        # Only redraw when the percentage or the bar changes, not on every step.
+        if drawn == self.last_drawn:
+            return
+        self.last_drawn = drawn
+        sys.stdout.write(bar)
+        sys.stdout.flush()
 
     def close(self) -> None:
-        print(self._get_progress_bar() + "\n", end="", flush=True)
+        bar, _ = self._get_progress_bar()
+        sys.stdout.write(bar + "\n")
+        sys.stdout.flush()
 
 
 def custom_progress_bar(total: int) -> Optional[ProgressBar]:
     if not logging.getLogger().getEffectiveLevel() <= logging.INFO:
         return None
+    # Bars from parallel workers would overwrite each other.
+    if multiprocessing.parent_process() is not None:
+        return None
     return ProgressBar(total)
 
 
@@ -1,12 +1,12 @@
 import logging
-import numbers
 import os
 import platform
 import sys
-import tomllib
 from dataclasses import dataclass, field
+from itertools import repeat
 from pathlib import Path
-from typing import Any, Callable, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional, Sequence
 
 from shuku.logging_setup import DEFAULT_LOG_LEVEL_NAME, LOG_LEVELS
 from shuku.utils import (
@@ -25,6 +25,9 @@ AUDIO_CODEC_ALIASES = {
 }
 CODEC_MAX_QUALITY = {"libmp3lame": 9, "aac": 10}
 DEFAULT_MAX_QUALITY = 10
+# Usual bitrates in kbps; values outside the range only trigger a warning.
+CODEC_BITRATE_RANGES = {"libopus": (6, 510)}
+DEFAULT_BITRATE_RANGE = (8, 1000)
 DEFAULT_AUDIO_QUALITY = "48k"
 FILE_EXISTS_OPTIONS = ["ask", "overwrite", "rename", "skip"]
 
@@ -44,14 +47,50 @@ class ConfigValidationError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConfigItem:
     description: str
     default_value: Any
     example_value: Optional[Any] = None
-    choices: Optional[list[Any]] = None
-    validators: list[Callable] = field(default_factory=list)
+    choices: Optional[Sequence[Any]] = None
+    validators: Sequence[Callable] = ()
     aliases: dict[str, Any] = field(default_factory=dict)
+    # Choices plus aliases, for validation; empty when any value is allowed.
+    valid_values: frozenset = field(init=False)
+
+    def __post_init__(self) -> None:
+        valid_values = (
+            frozenset(self.choices) | frozenset(self.aliases)
+            if self.choices
+            else frozenset()
+        )
+        object.__setattr__(self, "valid_values", valid_values)
+
+
+def is_bool(value: Any) -> bool:
+    return isinstance(value, bool)
+
+
+def is_number(value: Any) -> bool:
+    # TOML numbers are int or float; bool is an int subclass but not a number here.
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def is_optional_str(value: Any) -> bool:
+    return isinstance(value, str) if value else True
+
+
+def is_str_list(value: Any) -> bool:
+    # A bare string is iterable too, but it isn't a list of strings.
+    return isinstance(value, list) and all(map(isinstance, value, repeat(str)))
+
+
+def is_optional_str_list(value: Any) -> bool:
+    return is_str_list(value) if value else True
+
+
+def is_optional_dict(value: Any) -> bool:
+    return isinstance(value, dict) if value else True
 
 
 CONFIG_OPTIONS = {
@@ -64,18 +103,41 @@ CONFIG_OPTIONS = {
     "clean_output_filename": ConfigItem(
         description="Whether to clean output filenames by removing release tags, quality indicators, etc. If 'false', the original filename is used.",
         default_value=True,
-        validators=[lambda x: isinstance(x, bool)],
+        validators=[is_bool],
     ),
     "output_directory": ConfigItem(
         description="Directory to save output files. Defaults to the same directory as the input file.",
         default_value=None,
         example_value="~/Desktop/condensed",
-        validators=[lambda x: isinstance(x, str) if x else True],
+        validators=[is_optional_str],
     ),
     "output_suffix": ConfigItem(
         description="Suffix to add to output filenames.",
         default_value=" (condensed)",
     ),
+    "temp_directory": ConfigItem(
+        description="Directory for temporary files, such as extracted segments. Defaults to the system's temporary directory. A RAM-backed directory (e.g. /dev/shm) can speed things up if it has room for the segments.",
+        default_value=None,
+        example_value="/dev/shm",
+        validators=[is_optional_str],
+    ),
+    "segment_extraction_workers": ConfigItem(
+        description="How many segments to extract at once. Defaults to the number of CPU cores, up to 8. Lower it on slow disks.",
+        default_value=None,
+        example_value=4,
+        validators=[
+            lambda x: (
+                (isinstance(x, int) and not isinstance(x, bool) and x > 0)
+                if x is not None
+                else True
+            )
+        ],
+    ),
+    "thread_queue_size": ConfigItem(
+        description="Packets ffmpeg queues while reading extracted segments back. Larger values use more memory but keep the encoder fed.",
+        default_value=1024,
+        validators=[lambda x: isinstance(x, int) and not isinstance(x, bool) and x > 0],
+    ),
     "if_file_exists": ConfigItem(
         description=f"What to do when output file exists.",
         default_value="ask",
@@ -84,25 +146,25 @@ CONFIG_OPTIONS = {
     "padding": ConfigItem(
         description="Padding in seconds to add before and after each subtitle.",
         default_value=0.5,
-        validators=[lambda x: isinstance(x, numbers.Number)],
+        validators=[is_number],
     ),
     "subtitle_directory": ConfigItem(
         description="Directory to search for external subtitle files. Overridden by the --subtitles argument.",
         default_value=None,
         example_value="~/Videos/Subtitles",
-        validators=[lambda x: isinstance(x, str) if x else True],
+        validators=[is_optional_str],
     ),
     "audio_languages": ConfigItem(
         description="Automatically select audio tracks with these languages (in order of preference).",
         default_value=None,
         example_value=["jpn", "jp", "ja", "eng"],
-        validators=[lambda x: all(isinstance(lang, str) for lang in x) if x else True],
+        validators=[is_optional_str_list],
     ),
     "subtitle_languages": ConfigItem(
         description="Automatically select subtitle tracks with these languages (in order of preference).",
         default_value=None,
         example_value=["jpn", "jp", "ja", "eng"],
-        validators=[lambda x: all(isinstance(lang, str) for lang in x) if x else True],
+        validators=[is_optional_str_list],
     ),
     "external_subtitle_search": ConfigItem(
         description="Method for finding external subtitles. 'disabled' turns off external subtitle search. 'exact' requires a perfect match, while 'fuzzy' allows for inexact matches.",
@@ -135,7 +197,7 @@ CONFIG_OPTIONS = {
             "start credit",
             "trailer",
         ],
-        validators=[lambda x: all(isinstance(title, str) for title in x)],
+        validators=[is_str_list],
     ),
     "line_skip_patterns": ConfigItem(
         description="Regex patterns for lines to skip in subtitles. Use single-quoted strings.",
@@ -153,13 +215,13 @@ CONFIG_OPTIONS = {
             "^\\{[^\\}]*\\}$",  # Curly braces {}
             "^<[^>]*>$",  # Angle brackets <>
         ],
-        validators=[lambda x: all(isinstance(pattern, str) for pattern in x)],
+        validators=[is_str_list],
     ),
     # Condensed audio settings.
     "condensed_audio.enabled": ConfigItem(
         description="Create condensed audio.",
         default_value=True,
-        validators=[lambda x: isinstance(x, bool)],
+        validators=[is_bool],
     ),
     "condensed_audio.audio_codec": ConfigItem(
         description="Condensed audio codec.",
@@ -178,7 +240,7 @@ CONFIG_OPTIONS = {
             # Normalisation values based on https://podcasters.apple.com/support/893-audio-requirements
             "af": "loudnorm=I=-16:TP=-1:LRA=13,acompressor=threshold=-14dB:ratio=1.8:attack=30:release=300"
         },
-        validators=[lambda x: isinstance(x, dict) if x else True],
+        validators=[is_optional_dict],
     ),
     "condensed_audio.cover_art": ConfigItem(
         description="Cover art mode: 'auto' extracts a frame from video, 'disabled' skips cover art, or provide a path to an image file.",
@@ -189,7 +251,7 @@ CONFIG_OPTIONS = {
     "condensed_video.enabled": ConfigItem(
         description="Create condensed video.",
         default_value=False,
-        validators=[lambda x: isinstance(x, bool)],
+        validators=[is_bool],
     ),
     "condensed_video.audio_codec": ConfigItem(
         description="Audio codec for condensed video.",
@@ -215,13 +277,13 @@ CONFIG_OPTIONS = {
         description="Custom FFmpeg arguments for condensed video.",
         default_value=None,
         example_value={"preset": "faster", "crf": "23", "threads": "0", "tune": "film"},
-        validators=[lambda x: isinstance(x, dict) if x else True],
+        validators=[is_optional_dict],
     ),
     # Condensed subtitles settings.
     "condensed_subtitles.enabled": ConfigItem(
         description="Create condensed subtitles.",
         default_value=False,
-        validators=[lambda x: isinstance(x, bool)],
+        validators=[is_bool],
     ),
     "condensed_subtitles.format": ConfigItem(
         description="Output format for subtitles. 'auto' matches the input format.",
@@ -230,14 +292,24 @@ CONFIG_OPTIONS = {
     ),
 }
 
-DEFAULT_CONFIG = {key: item.default_value for key, item in CONFIG_OPTIONS.items()}
+# Read-only; callers that need a mutable config get their own dict.
+DEFAULT_CONFIG: Mapping[str, Any] = MappingProxyType(
+    {key: item.default_value for key, item in CONFIG_OPTIONS.items()}
+)
+
+# Codec keys and their quality keys, checked together by validate_config.
+AUDIO_QUALITY_KEYS = {
+    key: f"{key.removesuffix('.audio_codec')}.audio_quality"
+    for key in CONFIG_OPTIONS
+    if key.endswith(".audio_codec")
+}
 
 
 def load_config(config_path: Optional[str] = None) -> dict:
     if config_path:
         if config_path.lower() == "none":
             logging.info("Config path set to 'none'. Using default configuration.")
-            return DEFAULT_CONFIG.copy()
+            return dict(DEFAULT_CONFIG)
         else:
             exit_if_file_missing(config_path)
             return load_specific_config(config_path)
@@ -248,15 +320,16 @@ def load_config(config_path: Optional[str] = None) -> dict:
         return load_specific_config(config_path)
     else:
         logging.warning("No config file found. Using default configuration.")
-        return DEFAULT_CONFIG.copy()
+        return dict(DEFAULT_CONFIG)
 
 
 def load_specific_config(config_path: str) -> dict:
+    import tomllib  # Only needed when a config file is read.
+
     with open(config_path, "rb") as config_file:
         user_config = tomllib.load(config_file)
     flattened_user_config = flatten_dict(user_config)
-    config = DEFAULT_CONFIG.copy()
-    config.update(flattened_user_config)
+    config = {**DEFAULT_CONFIG, **flattened_user_config}
     resolved_config = resolve_aliases(config)
     validate_config(resolved_config)
     return resolved_config
@@ -278,14 +351,20 @@ def get_default_config_path() -> Path:
 def flatten_dict(
     d: dict[str, Any], parent_key: str = "", sep: str = "."
 ) -> dict[str, Any]:
-    items: list[tuple[str, Any]] = []
+    flat: dict[str, Any] = {}
+    add_flattened_items(flat, d, parent_key, sep)
+    return flat
+
+
+def add_flattened_items(
+    flat: dict[str, Any], d: dict[str, Any], parent_key: str, sep: str
+) -> None:
     for k, v in d.items():
         new_key = f"{parent_key}{sep}{k}" if parent_key else k
         if isinstance(v, dict) and "custom_ffmpeg_args" not in new_key:
-            items.extend(flatten_dict(v, new_key, sep=sep).items())
+            add_flattened_items(flat, v, new_key, sep)
         else:
-            items.append((new_key, v))
-    return dict(items)
+            flat[new_key] = v
 
 
 def resolve_aliases(config: dict[str, Any]) -> dict[str, Any]:
@@ -302,7 +381,7 @@ def resolve_aliases(config: dict[str, Any]) -> dict[str, Any]:
     return resolved_config
 
 
-def validate_config(config: dict[str, Any]) -> None:
+def validate_config(config: Mapping[str, Any]) -> None:
     if not any(
         config.get(option)
         for option in [
@@ -313,27 +392,26 @@ def validate_config(config: dict[str, Any]) -> None:
     ):
         logging.error("All condensing options are disabled. Nothing to do.")
         sys.exit(1)
-    valid_keys = set(CONFIG_OPTIONS.keys())
-    unknown_keys = set(config.keys()) - valid_keys
+    unknown_keys = [key for key in config if key not in CONFIG_OPTIONS]
     if unknown_keys:
-        logging.error(f"Unknown configuration keys: {', '.join(unknown_keys)}")
-        logging.error(f"Expected one of: {', '.join(valid_keys)}")
+        logging.error(f"Unknown configuration keys: {', '.join(sorted(unknown_keys))}")
+        logging.error(f"Expected one of: {', '.join(CONFIG_OPTIONS)}")
         sys.exit(1)
     for key, value in config.items():
         schema_item = CONFIG_OPTIONS[key]
-        if schema_item.choices:
-            valid_values = set(schema_item.choices) | set(schema_item.aliases.keys())
-            if value not in valid_values:
-                logging.error(
-                    f"Invalid value for {key}: '{value}'. Must be one of: {', '.join(map(str, valid_values))}"
-                )
-                sys.exit(1)
+        valid_values = schema_item.valid_values
+        if valid_values and value not in valid_values:
+            logging.error(
+                f"Invalid value for {key}: '{value}'. Must be one of: {', '.join(map(str, valid_values))}"
+            )
+            sys.exit(1)
         for validator in schema_item.validators:
             if not validator(value):
                 logging.error(f"Validation failed for {key} with value '{value}'")
                 sys.exit(1)
-        if key.endswith(".audio_codec"):
-            validate_audio_quality(value, config.get(f"{key[:-12]}.audio_quality"))
+    for codec_key, quality_key in AUDIO_QUALITY_KEYS.items():
+        if codec_key in config:
+            validate_audio_quality(config[codec_key], config.get(quality_key))
 
 
 def validate_audio_quality(codec: str, quality: Optional[Any]) -> None:
@@ -360,9 +438,8 @@ def validate_bitrate_or_scale(codec: str, quality: Any) -> None:
             quality = quality.lower()
             if quality.endswith("k"):
                 value = float(quality[:-1])
-                if codec == "libopus" and not 6 <= value <= 510:
-                    warn(f"Unusual bitrate '{quality}'")
-                elif not 8 <= value <= 1000:
+                low, high = CODEC_BITRATE_RANGES.get(codec, DEFAULT_BITRATE_RANGE)
+                if not low <= value <= high:
                     warn(f"Unusual bitrate '{quality}'")
                 return
             elif quality.startswith("v"):
@@ -379,8 +456,9 @@ def validate_bitrate_or_scale(codec: str, quality: Any) -> None:
             value = float(quality)
         if value < 0:
             error(f"Negative quality value '{quality}' not allowed")
-        if codec == "libopus":
-            if not 6000 <= value <= 510000:
+        if codec in CODEC_BITRATE_RANGES:
+            low, high = CODEC_BITRATE_RANGES[codec]
+            if not low * 1000 <= value <= high * 1000:
                 warn(f"Unusual bitrate '{value}'")
         if value > CODEC_MAX_QUALITY.get(codec, DEFAULT_MAX_QUALITY):
             warn(f"Quality value '{quality}' unusually high")
@@ -423,20 +501,20 @@ def dump_default_config() -> None:
 
 
 def generate_config_content() -> str:
-    config_content = DEFAULT_CONFIG_HEADER
+    content_parts = [DEFAULT_CONFIG_HEADER]
     sections: dict[str, dict[str, ConfigItem]] = {}
     for key, item in CONFIG_OPTIONS.items():
         parts = key.split(".")
         if len(parts) == 1:
-            config_content += generate_item_content(key, item)
+            content_parts.append(generate_item_content(key, item))
         else:
             section, subkey = parts[0], ".".join(parts[1:])
             sections.setdefault(section, {})[subkey] = item
     for section, items in sections.items():
-        config_content += f"\n[{section}]\n"
+        content_parts.append(f"\n[{section}]\n")
         for subkey, item in items.items():
-            config_content += generate_item_content(subkey, item)
-    return config_content.rstrip() + "\n"
+            content_parts.append(generate_item_content(subkey, item))
+    return "".join(content_parts).rstrip() + "\n"
 
 
 def generate_item_content(key: str, item: ConfigItem) -> str:
@@ -461,11 +539,8 @@ def generate_item_content(key: str, item: ConfigItem) -> str:
         else "null"
     )
     if key == "line_skip_patterns":
-        default_value_str = f"{key} = [\n"
-        default_value_str += "".join(
-            f"    {repr(pattern)},\n" for pattern in item.default_value
-        )
-        default_value_str += "]\n"
+        patterns = "".join(f"    {repr(pattern)},\n" for pattern in item.default_value)
+        default_value_str = f"{key} = [\n{patterns}]\n"
     elif item.default_value is None:
         default_value_str = f"# {key} = {example_value}\n"
     elif isinstance(item.default_value, bool):
@@ -6,6 +6,18 @@ from typing import Any
 
 from shuku.cli import Context
 
+try:
+    import orjson
+
+    def dump_json(data: Any) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+except ImportError:
+
+    def dump_json(data: Any) -> bytes:
+        return json.dumps(data, indent=2).encode("utf-8")
+
+
 JSON_OUTPUT_FOLDER = os.path.expanduser("~/Desktop/JSON_timings")
 
 
@@ -21,17 +33,17 @@ def save_segments_as_json(
     duration = get_video_duration(context.stream_info)
     data = {
         "totalDuration": duration,
-        "segments": [
-            {"start": start, "duration": end - start} for start, end in segments
-        ],
+        # Parallel arrays keep the file small; the demo pairs them by index.
+        "starts": [start for start, _ in segments],
+        "durations": [end - start for start, end in segments],
     }
-    with open(json_path, "w") as f:
-        json.dump(data, f, indent=2)
+    with open(json_path, "wb") as f:
+        f.write(dump_json(data))
     logging.info(f"Speech segments JSON saved to: {json_path}")
 
 
 def get_video_duration(stream_info: dict[str, Any]) -> float:
     video_stream = stream_info["video"][0]
     duration_str = video_stream["tags"].get("DURATION", "00:00:00.000000000")
-    hours, minutes, seconds = map(float, duration_str.split(":"))
-    return hours * 3600 + minutes * 60 + seconds
+    hours, minutes, seconds = duration_str.split(":", 2)
+    return float(hours) * 3600 + float(minutes) * 60 + float(seconds)
@@ -1,5 +1,10 @@
 import logging
-from typing import Any, Optional
+import multiprocessing
+import time
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from multiprocessing.queues import Queue
+from typing import Any, Iterator, Optional
 
 # Custom SUCCESS level.
 SUCCESS = 25  # between INFO (20) and WARNING (30)
@@ -23,6 +28,11 @@ def addLoggingLevel(
     if not methodName:
         methodName = levelName.lower()
 
+    # Already registered (e.g. the module was reloaded): nothing to do.
+    if getattr(logging, levelName, None) == levelNum and hasattr(
+        logging.getLoggerClass(), methodName
+    ):
+        return
     if hasattr(logging, levelName):
         raise AttributeError(f"{levelName} already defined in logging module")
     if hasattr(logging, methodName):
@@ -48,18 +58,22 @@ def addLoggingLevel(
 addLoggingLevel("SUCCESS", SUCCESS)
 
 
+LEVEL_EMOJI = {
+    logging.DEBUG: "🐛",
+    logging.INFO: "💬️",
+    SUCCESS: "✅",
+    logging.WARNING: "⚠️ ",
+    logging.ERROR: "❌",
+    logging.CRITICAL: "🚨",
+}
+
+
 class CuteFormatter(logging.Formatter):
     def format(self, record):
-        emoji = {
-            logging.DEBUG: "🐛",
-            logging.INFO: "💬️",
-            SUCCESS: "✅",
-            logging.WARNING: "⚠️ ",
-            logging.ERROR: "❌",
-            logging.CRITICAL: "🚨",
-        }.get(record.levelno, "💬️")
-
-        return f"[{self.formatTime(record, '%H:%M:%S')}] {emoji} {record.getMessage()}"
+        emoji = LEVEL_EMOJI.get(record.levelno, "💬️")
+        # Same output as formatTime(record, "%H:%M:%S"), without the datefmt checks.
+        timestamp = time.strftime("%H:%M:%S", self.converter(record.created))
+        return f"[{timestamp}] {emoji} {record.getMessage()}"
 
 
 def setup_initial_logging(
@@ -93,3 +107,26 @@ def update_logging_level(loglevel: str) -> None:
             f"Invalid loglevel level: '{loglevel}'. Choose from {', '.join(LOG_LEVELS.keys())}."
         )
     logging.getLogger().setLevel(LOG_LEVELS[loglevel])
+
+
+@contextmanager
+def forward_worker_logs() -> Iterator[Queue]:
+    """Relay log records sent by worker processes to the main process handlers."""
+    log_queue: Queue = multiprocessing.Queue()
+    listener = QueueListener(
+        log_queue, *logging.getLogger().handlers, respect_handler_level=True
+    )
+    listener.start()
+    try:
+        yield log_queue
+    finally:
+        listener.stop()
+
+
+def setup_worker_logging(log_queue: Queue, level: int) -> None:
+    root_logger = logging.getLogger()
+    # Forked workers inherit the parent's handlers; send everything through the queue instead.
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(QueueHandler(log_queue))
+    root_logger.setLevel(level)
@@ -21,20 +21,21 @@ def prompt_user_choice(prompt: str, choices: list[str], default: str) -> str:
     default_choice = find_default_choice(choices, default)
     separator = "\n" if len(prompt) > MAX_PROMPT_LENGTH else " "
     full_prompt = f"{prompt}{separator}{options}? (default: {default_choice}): "
+    choice_by_letter: dict[str, str] = {}
+    for choice in choices:
+        # The first choice wins when two share a letter.
+        choice_by_letter.setdefault(choice[0].lower(), choice.lower())
+    invalid_message = (
+        f"Invalid selection. Please choose from: {', '.join(choice[0].lower() for choice in choices)}, "
+        f"or press Enter for default ({default_choice})."
+    )
     while True:
         user_input = input(full_prompt).strip().lower()
         if user_input == "":
             return default.lower()
-        if is_valid_choice(user_input, choices):
-            return next(
-                choice.lower()
-                for choice in choices
-                if choice.lower().startswith(user_input)
-            )
-        print(
-            f"Invalid selection. Please choose from: {', '.join(choice[0].lower() for choice in choices)}, "
-            f"or press Enter for default ({default_choice})."
-        )
+        if user_input in choice_by_letter:
+            return choice_by_letter[user_input]
+        print(invalid_message)
 
 
 def format_choices(choices: list[str]) -> str:
@@ -50,7 +51,3 @@ def find_default_choice(choices: list[str], default: str) -> Optional[str]:
     return next(
         (choice for choice in choices if choice.lower() == default.lower()), None
     )
-
-
-def is_valid_choice(user_input: str, choices: list[str]) -> bool:
-    return any(user_input == choice[0].lower() for choice in choices)
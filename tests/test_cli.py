@@ -1,11 +1,12 @@
 import argparse
+import errno
 import json
 import logging
 import os
 import re
 import sys
 import time
-from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from io import StringIO
 from pathlib import Path
@@ -20,9 +21,17 @@ from shuku.cli import (
     PENALIZED_SUBTITLE_KEYWORDS,
     Context,
     FileProcessingError,
+    ProgressBar,
+    can_select_audio_in_single_pass,
+    can_select_video_in_single_pass,
+    character_based_similarity,
+    compile_line_skip_patterns,
     convert_to_lrc,
+    create_audio_select_filter_script,
     create_concat_file,
     create_condensed_subtitles,
+    create_video_select_filter_script,
+    disable_prompts,
     display_and_select_stream,
     encode_final_audio,
     extract_season_and_episode,
@@ -30,6 +39,7 @@ from shuku.cli import (
     extract_speech_timing_from_subtitles,
     extract_subtitles,
     filter_chapters_in_place,
+    filter_events_in_place,
     filter_skip_patterns_in_place,
     find_matching_subtitle_file,
     find_subtitles,
@@ -37,19 +47,31 @@ from shuku.cli import (
     generate_output_path,
     get_all_stream_info,
     get_audio_extension,
+    get_constant_frame_rate,
+    get_destination_path,
     get_ffmpeg_audio_options,
+    get_ffmpeg_thread_options,
     get_ffmpeg_video_options,
     get_input_files,
+    get_plaintext,
     get_skipped_chapter_intervals,
+    get_temp_directory,
+    list_subtitle_files,
+    load_subtitles,
     main,
     merge_overlapping_segments,
+    parse_arguments,
     prepare_filename_for_display,
     prepare_filename_for_matching,
     process_file,
+    process_file_safely,
+    process_files_in_parallel,
+    prune_subtitle_cache,
     resolve_cover_image,
     safe_move,
     select_audio_stream,
     sort_subtitle_streams,
+    strip_release_tags,
     strip_subtitle_styles,
     verify_ffmpeg_and_ffprobe_availability,
 )
@@ -57,13 +79,20 @@ from shuku.config import DEFAULT_CONFIG
 from shuku.utils import prompt_user_choice
 
 
+# Keep the subtitle cache out of the user's cache directory.
+@pytest.fixture(autouse=True)
+def isolate_cache_directory(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path / "cache"))
+
+
 @pytest.fixture
 def base_context(tmp_path):
     input_path = str(tmp_path / "input.mkv")
     input_name = "input"
     return Context(
         file_path=input_path,
-        config=deepcopy(DEFAULT_CONFIG),
+        config=dict(DEFAULT_CONFIG),
         args=argparse.Namespace(
             sub_delay=0,
             output=None,
@@ -186,6 +215,22 @@ def test_find_subtitles_with_config_directory(base_context, tmp_path):
     mock_find.assert_called_once()
 
 
+def test_find_subtitles_searches_shared_directory_once(base_context, tmp_path):
+    base_context.args.subtitles = None
+    base_context.config = {
+        "external_subtitle_search": "enabled",
+        "subtitle_directory": str(tmp_path),
+    }
+    base_context.file_path = str(tmp_path / "video.mp4")
+    base_context.input_name = "video"
+    with (
+        patch("shuku.cli.find_matching_subtitle_file", return_value=None) as mock_find,
+        patch("shuku.cli.extract_subtitles", return_value=None),
+    ):
+        find_subtitles(base_context)
+    mock_find.assert_called_once_with(base_context, str(tmp_path), "video")
+
+
 def test_find_subtitles_arg_priority_over_config(base_context, tmp_path):
     arg_dir = tmp_path / "arg_dir"
     arg_dir.mkdir()
@@ -385,6 +430,109 @@ def test_skip_music_and_short_non_kanji_lines(mock_subs):
     ]
 
 
+def test_compile_line_skip_patterns_is_cached():
+    patterns = ("^♪.*♪$", r"^\(.*\)$")
+    compiled = compile_line_skip_patterns(patterns)
+    assert len(compiled) == 1
+    assert compile_line_skip_patterns(tuple(patterns)) is compiled
+
+
+def test_fused_skip_patterns_match_individual_patterns(mock_subs):
+    patterns = ("^♪.*♪$", r"(?m)^[^\u4E00-\u9FFF]{1,3}$", "(?ix) back \\s to # comment")
+    (fused,) = compile_line_skip_patterns(patterns)
+    compiled = [re.compile(pattern) for pattern in patterns]
+    for line in mock_subs:
+        expected = any(pattern.match(line.plaintext) for pattern in compiled)
+        assert bool(fused.match(line.plaintext)) == expected
+
+
+def test_compile_line_skip_patterns_keeps_backreferences_separate():
+    patterns = (r"^(.)\1", r"^(\w+) \1$")
+    compiled = compile_line_skip_patterns(patterns)
+    assert [pattern.pattern for pattern in compiled] == list(patterns)
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["Plain line", r"{\i1}Tagged{\i0} line", r"Two\Nlines", r"Hard\hspace", "♪ {} ♪"],
+)
+def test_get_plaintext_matches_pysubs2(text):
+    line = pysubs2.SSAEvent(text=text)
+    assert get_plaintext(line) == line.plaintext
+
+
+def test_load_subtitles_uses_cache_until_file_changes(base_context, tmp_path):
+    base_context.temp_dir = str(tmp_path / "temp")
+    subtitle_path = tmp_path / "external.srt"
+    subtitle_path.write_text("1\n00:00:01,000 --> 00:00:02,000\nHello\n")
+    with patch("shuku.cli.pysubs2.load", wraps=pysubs2.load) as mock_load:
+        first = load_subtitles(base_context, str(subtitle_path))
+        second = load_subtitles(base_context, str(subtitle_path))
+        assert mock_load.call_count == 1
+        assert [line.text for line in second] == [line.text for line in first]
+        subtitle_path.write_text("1\n00:00:01,000 --> 00:00:02,000\nGoodbye\n")
+        os.utime(subtitle_path, ns=(0, 0))
+        third = load_subtitles(base_context, str(subtitle_path))
+        assert mock_load.call_count == 2
+        assert [line.text for line in third] == ["Goodbye"]
+    # The changed file replaced its cache entry instead of adding another.
+    assert len(list((tmp_path / "cache").rglob("*.pickle"))) == 1
+
+
+def test_load_subtitles_cache_key_includes_versions(base_context, tmp_path):
+    base_context.temp_dir = str(tmp_path / "temp")
+    subtitle_path = tmp_path / "external.srt"
+    subtitle_path.write_text("1\n00:00:01,000 --> 00:00:02,000\nHello\n")
+    load_subtitles(base_context, str(subtitle_path))
+    with (
+        patch("shuku.cli.version", return_value="999.0"),
+        patch("shuku.cli.pysubs2.load", wraps=pysubs2.load) as mock_load,
+    ):
+        load_subtitles(base_context, str(subtitle_path))
+    # An upgraded pysubs2 parses again instead of loading the old pickle.
+    mock_load.assert_called_once()
+
+
+def test_prune_subtitle_cache(tmp_path):
+    now = time.time()
+    expired = tmp_path / "expired.pickle"
+    stale_temp = tmp_path / "stale.123.tmp"
+    entries = [tmp_path / f"{name}.pickle" for name in ("oldest", "older", "newest")]
+    for age, path in enumerate(reversed([expired, stale_temp, *entries])):
+        path.write_bytes(b"")
+        os.utime(path, (now - age * 60, now - age * 60))
+    for path in (expired, stale_temp):
+        os.utime(path, (now - 40 * 86400, now - 40 * 86400))
+    with patch("shuku.cli.SUBTITLE_CACHE_MAX_ENTRIES", 2):
+        prune_subtitle_cache(tmp_path)
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "newest.pickle",
+        "older.pickle",
+    ]
+
+
+def test_load_subtitles_skips_cache(base_context, tmp_path):
+    base_context.temp_dir = str(tmp_path / "temp")
+    subtitle_path = tmp_path / "external.srt"
+    subtitle_path.write_text("1\n00:00:01,000 --> 00:00:02,000\nHello\n")
+    base_context.args.no_cache = True
+    with patch("shuku.cli.pysubs2.load", wraps=pysubs2.load) as mock_load:
+        load_subtitles(base_context, str(subtitle_path))
+        load_subtitles(base_context, str(subtitle_path))
+        assert mock_load.call_count == 2
+    assert not (tmp_path / "cache").exists()
+
+
+def test_load_subtitles_passes_format_of_extracted_subtitles(base_context, tmp_path):
+    base_context.temp_dir = str(tmp_path)
+    subtitle_path = tmp_path / "subtitles_2.srt"
+    subtitle_path.write_text("1\n00:00:01,000 --> 00:00:02,000\nHello\n")
+    with patch("shuku.cli.pysubs2.load", wraps=pysubs2.load) as mock_load:
+        subs = load_subtitles(base_context, str(subtitle_path))
+    mock_load.assert_called_once_with(str(subtitle_path), format_="srt")
+    assert [line.text for line in subs] == ["Hello"]
+
+
 def test_empty_subtitle_file():
     empty_subs = pysubs2.SSAFile()
     skip_patterns: list[re.Pattern] = []
@@ -418,11 +566,7 @@ def test_create_concat_file():
     segment_files = ["segment1.ts", "segment2.ts", "segment3.ts"]
     temp_dir = "/tmp"
     expected_concat_file = "/tmp/concat.txt"
-    expected_calls = [
-        call("file 'segment1.ts'\n"),
-        call("file 'segment2.ts'\n"),
-        call("file 'segment3.ts'\n"),
-    ]
+    expected_content = "file 'segment1.ts'\nfile 'segment2.ts'\nfile 'segment3.ts'\n"
     mock_open_file = mock_open()
     with (
         patch("shuku.cli.open", mock_open_file),
@@ -432,8 +576,98 @@ def test_create_concat_file():
         assert result == expected_concat_file
         mock_open_file.assert_called_once_with(expected_concat_file, "w")
         file_handle = mock_open_file()
-        file_handle.write.assert_has_calls(expected_calls)
-        assert file_handle.write.call_count == len(segment_files)
+        file_handle.write.assert_called_once_with(expected_content)
+
+
+def test_create_audio_select_filter_script(tmp_path):
+    filter_script = create_audio_select_filter_script(
+        [(0.5, 2.25), (10.0, 12.3456)], str(tmp_path)
+    )
+    assert Path(filter_script).read_text() == (
+        "aselect='between(t,0.500,2.250)+between(t,10.000,12.346)',asetpts=N/SR/TB"
+    )
+
+
+@pytest.mark.parametrize(
+    "overrides, expected",
+    [
+        ({}, True),
+        ({"condensed_video.enabled": True}, True),
+        ({"condensed_audio.enabled": False}, False),
+        ({"condensed_audio.audio_codec": "copy"}, False),
+        ({"condensed_audio.custom_ffmpeg_args": {"af": "volume=2"}}, False),
+        ({"condensed_audio.custom_ffmpeg_args": {"ar": "22050"}}, True),
+    ],
+)
+def test_can_select_audio_in_single_pass(base_context, overrides, expected):
+    base_context.config["condensed_audio.enabled"] = True
+    base_context.config["condensed_video.enabled"] = False
+    base_context.config.update(overrides)
+    assert can_select_audio_in_single_pass(base_context) is expected
+
+
+@pytest.mark.parametrize(
+    "overrides, expected",
+    [
+        ({}, True),
+        ({"condensed_video.enabled": False}, False),
+        ({"condensed_video.video_codec": "copy"}, False),
+        ({"condensed_video.audio_codec": "copy"}, False),
+        ({"condensed_video.custom_ffmpeg_args": {"vf": "scale=640:-2"}}, False),
+        ({"condensed_video.custom_ffmpeg_args": {"preset": "fast"}}, True),
+    ],
+)
+def test_can_select_video_in_single_pass(base_context, overrides, expected):
+    base_context.stream_info["video"] = [
+        {"index": 0, "avg_frame_rate": "30000/1001", "r_frame_rate": "30000/1001"}
+    ]
+    base_context.config["condensed_video.enabled"] = True
+    base_context.config["condensed_video.video_codec"] = "libx264"
+    base_context.config["condensed_video.audio_codec"] = "aac"
+    base_context.config.update(overrides)
+    assert can_select_video_in_single_pass(base_context) is expected
+
+
+@pytest.mark.parametrize(
+    "video_stream, expected",
+    [
+        ({"avg_frame_rate": "30000/1001", "r_frame_rate": "30000/1001"}, "30000/1001"),
+        ({"avg_frame_rate": "25/1", "r_frame_rate": "25/1"}, "25/1"),
+        # Variable frame rate.
+        ({"avg_frame_rate": "4789/200", "r_frame_rate": "24000/1001"}, None),
+        ({"avg_frame_rate": "0/0", "r_frame_rate": "0/0"}, None),
+        ({}, None),
+    ],
+)
+def test_get_constant_frame_rate(base_context, video_stream, expected):
+    base_context.stream_info["video"] = [{"index": 0, **video_stream}]
+    assert get_constant_frame_rate(base_context) == expected
+
+
+def test_can_select_video_in_single_pass_needs_constant_frame_rate(base_context):
+    base_context.config["condensed_video.enabled"] = True
+    base_context.config["condensed_video.video_codec"] = "libx264"
+    base_context.config["condensed_video.audio_codec"] = "aac"
+    base_context.stream_info["video"] = [
+        {"index": 0, "avg_frame_rate": "4789/200", "r_frame_rate": "24000/1001"}
+    ]
+    assert can_select_video_in_single_pass(base_context) is False
+
+
+def test_create_video_select_filter_script(base_context, tmp_path):
+    base_context.temp_dir = str(tmp_path)
+    base_context.stream_info["video"] = [
+        {"index": 0, "avg_frame_rate": "30000/1001", "r_frame_rate": "30000/1001"}
+    ]
+    base_context.selected_audio_stream = "2"
+    filter_script = create_video_select_filter_script(
+        base_context, [(0.5, 2.25), (10.0, 12.3456)]
+    )
+    expression = "between(t,0.500,2.250)+between(t,10.000,12.346)"
+    assert Path(filter_script).read_text() == (
+        f"[0:0]select='{expression}',setpts=N/(30000/1001)/TB[v];"
+        f"[0:2]aselect='{expression}',asetpts=N/SR/TB[a]"
+    )
 
 
 def test_find_subtitles_external_subs(base_context):
@@ -500,7 +734,7 @@ def test_select_audio_stream_first_available(base_context):
         chosen_index = select_audio_stream(base_context)
     assert chosen_index == "0"
     mock_display_and_select.assert_called_once_with(
-        base_context.stream_info["audio"], "audio"
+        base_context.stream_info["audio"], "audio", interactive=True
     )
 
 
@@ -516,12 +750,22 @@ def test_select_audio_stream_no_streams(base_context):
         select_audio_stream(base_context)
 
 
-def test_get_all_stream_info_no_streams():
-    file_path = "dummy_input.mp4"
-    with patch.object(FFmpeg, "execute", return_value=json.dumps({"streams": []})):
-        with pytest.raises(FileProcessingError) as exc_info:
-            get_all_stream_info(file_path)
-        assert "Error processing dummy_input.mp4" in str(exc_info.value)
+@pytest.fixture
+def ffprobe_output():
+    """Patch ffprobe once; the test sets the JSON it prints."""
+    with patch.object(FFmpeg, "execute") as mock_execute:
+
+        def set_output(data: dict) -> None:
+            mock_execute.return_value = json.dumps(data)
+
+        yield set_output
+
+
+def test_get_all_stream_info_no_streams(ffprobe_output):
+    ffprobe_output({"streams": []})
+    with pytest.raises(FileProcessingError) as exc_info:
+        get_all_stream_info("dummy_input.mp4")
+    assert "Error processing dummy_input.mp4" in str(exc_info.value)
 
 
 def test_find_subtitles_prefer_external_false_extracted_subs(base_context):
@@ -648,41 +892,37 @@ def test_extract_subtitles_no_matching_language(base_context):
             "No subtitles found for specified languages: fra, deu."
         )
         mock_display_and_select.assert_called_once_with(
-            base_context.stream_info["subtitle"], "subtitle"
+            base_context.stream_info["subtitle"], "subtitle", interactive=True
         )
 
 
-def test_get_all_stream_info_subtitle_success():
-    file_path = "dummy_input.mp4"
+def test_get_all_stream_info_subtitle_success(ffprobe_output):
     expected_streams = [
         {"index": 0, "codec_type": "video", "tags": {"language": "eng"}},
         {"index": 1, "codec_type": "subtitle", "tags": {"language": "eng"}},
         {"index": 2, "codec_type": "subtitle", "tags": {"language": "jpn"}},
         {"index": 3, "codec_type": "audio", "tags": {"language": "eng"}},
     ]
-    mock_data = {"streams": expected_streams}
-    with patch.object(FFmpeg, "execute", return_value=json.dumps(mock_data)):
-        result = get_all_stream_info(file_path)
-        assert result["subtitle"] == [
-            {"index": 1, "codec_type": "subtitle", "tags": {"language": "eng"}},
-            {"index": 2, "codec_type": "subtitle", "tags": {"language": "jpn"}},
-        ]
-        assert "audio" in result
-        assert "video" in result
+    ffprobe_output({"streams": expected_streams})
+    result = get_all_stream_info("dummy_input.mp4")
+    assert result["subtitle"] == [
+        {"index": 1, "codec_type": "subtitle", "tags": {"language": "eng"}},
+        {"index": 2, "codec_type": "subtitle", "tags": {"language": "jpn"}},
+    ]
+    assert "audio" in result
+    assert "video" in result
 
 
-def test_get_all_stream_info_no_subtitle_streams():
-    file_path = "dummy_input.mp4"
+def test_get_all_stream_info_no_subtitle_streams(ffprobe_output):
     expected_streams = [
         {"index": 0, "codec_type": "video", "tags": {"language": "eng"}},
         {"index": 1, "codec_type": "audio", "tags": {"language": "eng"}},
     ]
-    mock_data = {"streams": expected_streams}
-    with patch.object(FFmpeg, "execute", return_value=json.dumps(mock_data)):
-        result = get_all_stream_info(file_path)
-        assert result["subtitle"] == []
-        assert "audio" in result
-        assert "video" in result
+    ffprobe_output({"streams": expected_streams})
+    result = get_all_stream_info("dummy_input.mp4")
+    assert result["subtitle"] == []
+    assert "audio" in result
+    assert "video" in result
 
 
 def test_merge_overlapping_segments_empty_input():
@@ -808,7 +1048,6 @@ def test_safe_move_renaming_behavior(base_context, tmpdir, monkeypatch):
     assert str(datetime.now().year) in result1
     assert result1.startswith(str(tmpdir.join("destination_")))
     assert result1.endswith(".txt")
-    time.sleep(1)  # Ensure different timestamps.
     source = tmpdir.join("source2.txt")
     source.write("newer content")
     result2 = safe_move(base_context, str(source), str(destination))
@@ -840,6 +1079,38 @@ def test_safe_move_skip_behavior(base_context, tmpdir, monkeypatch):
     assert result == ""
 
 
+def test_safe_move_falls_back_to_copy_across_filesystems(base_context, tmp_path):
+    temp_file = tmp_path / "temp.srt"
+    temp_file.write_text("content")
+    final_path = str(tmp_path / "final.srt")
+    cross_device = OSError(errno.EXDEV, "Invalid cross-device link")
+    with (
+        patch("shuku.cli.os.replace", side_effect=cross_device),
+        patch("shuku.cli.shutil.move") as mock_move,
+    ):
+        assert safe_move(base_context, str(temp_file), final_path) == final_path
+    mock_move.assert_called_once_with(str(temp_file), final_path)
+
+
+def test_get_destination_path_reserves_renamed_paths(base_context, tmp_path):
+    base_context.config["if_file_exists"] = "rename"
+    final_path = tmp_path / "output.mp4"
+    final_path.write_text("existing")
+    # Two jobs renaming the same output must not pick the same name.
+    first = get_destination_path(base_context, str(final_path))
+    second = get_destination_path(base_context, str(final_path))
+    assert first != second
+    assert os.path.exists(first) and os.path.exists(second)
+
+
+def test_get_destination_path_reserves_free_path(base_context, tmp_path):
+    base_context.config["if_file_exists"] = "skip"
+    final_path = str(tmp_path / "output.mp4")
+    assert get_destination_path(base_context, final_path) == final_path
+    # A second job writing the same output now finds it taken.
+    assert get_destination_path(base_context, final_path) is None
+
+
 def test_safe_move_non_existent_destination(base_context, tmpdir):
     source = tmpdir.join("source.txt")
     source.write("content")
@@ -944,23 +1215,45 @@ def test_get_input_files_mixed_input(mock_file_structure):
     assert set(result) == set(expected)
 
 
-def test_get_input_files_nonexistent_file(caplog):
-    with caplog.at_level(logging.WARNING):
-        with pytest.raises(SystemExit) as exc_info:
-            get_input_files(["nonexistent.txt"])
-    assert exc_info.value.code == 1
-    assert "Invalid input" in caplog.text
-    assert "nonexistent.txt" in caplog.text
-    assert "No valid files found. Exiting." in caplog.text
+def test_get_input_files_nested_directories_skip_symlinked_dirs(tmp_path):
+    (tmp_path / "season" / "extras").mkdir(parents=True)
+    (tmp_path / "season" / "ep1.mkv").touch()
+    (tmp_path / "season" / "extras" / "ep2.mkv").touch()
+    (tmp_path / "season" / "loop").symlink_to(tmp_path / "season")
+    result = get_input_files([str(tmp_path / "season")])
+    assert result == [
+        str(tmp_path / "season" / "ep1.mkv"),
+        str(tmp_path / "season" / "extras" / "ep2.mkv"),
+    ]
+
+
+def test_get_temp_directory(tmp_path):
+    assert get_temp_directory({"temp_directory": None}) is None
+    temp_directory = tmp_path / "fast" / "temp"
+    assert get_temp_directory({"temp_directory": str(temp_directory)}) == str(
+        temp_directory
+    )
+    assert temp_directory.is_dir()
 
 
-def test_get_input_files_nonexistent_directory(caplog):
+@pytest.mark.parametrize(
+    "inputs",
+    [
+        ["nonexistent.txt"],
+        ["nonexistent_dir"],
+        ["nonexistent1.txt", "nonexistent2.txt"],
+        ["/dev/null" if sys.platform != "win32" else "NUL"],
+    ],
+    ids=["file", "directory", "multiple", "special_file"],
+)
+def test_get_input_files_invalid_inputs(inputs, caplog):
     with caplog.at_level(logging.WARNING):
         with pytest.raises(SystemExit) as exc_info:
-            get_input_files(["nonexistent_dir"])
+            get_input_files(inputs)
     assert exc_info.value.code == 1
     assert "Invalid input" in caplog.text
-    assert "nonexistent_dir" in caplog.text
+    for input_path in inputs:
+        assert input_path in caplog.text
     assert "No valid files found. Exiting." in caplog.text
 
 
@@ -970,34 +1263,6 @@ def test_get_input_files_empty_input():
     assert exc_info.value.code == 1
 
 
-def test_get_input_files_all_invalid_inputs(caplog):
-    with caplog.at_level(logging.WARNING):
-        with pytest.raises(SystemExit) as exc_info:
-            get_input_files(["nonexistent1.txt", "nonexistent2.txt"])
-    assert exc_info.value.code == 1
-    assert "Invalid input" in caplog.text
-    assert "Invalid input" in caplog.text
-    assert "nonexistent1.txt" in caplog.text
-    assert "nonexistent2.txt" in caplog.text
-    assert "No valid files found. Exiting." in caplog.text
-
-
-@pytest.mark.parametrize(
-    "file_path",
-    [
-        "/dev/null" if sys.platform != "win32" else "NUL",
-    ],
-)
-def test_get_input_files_special_files(file_path, caplog):
-    with caplog.at_level(logging.WARNING):
-        with pytest.raises(SystemExit) as exc_info:
-            get_input_files([file_path])
-    assert exc_info.value.code == 1
-    assert "Invalid input" in caplog.text
-    assert file_path in caplog.text
-    assert "No valid files found" in caplog.text
-
-
 def test_get_input_files_symlink(tmp_path):
     real_file = tmp_path / "real_file.txt"
     real_file.write_text("content")
@@ -1007,19 +1272,10 @@ def test_get_input_files_symlink(tmp_path):
     assert result == [str(symlink)]
 
 
-def test_get_input_files_permission_denied(tmp_path, monkeypatch):
+def test_get_input_files_permission_denied(tmp_path):
     file_path = tmp_path / "no_permission.txt"
     file_path.write_text("content")
-
-    def mock_exists(path):
-        return True
-
-    def mock_isfile(path):
-        return True
-
-    monkeypatch.setattr(os.path, "exists", mock_exists)
-    monkeypatch.setattr(os.path, "isfile", mock_isfile)
-
+    # Listing inputs only stats them; unreadable files are still collected.
     with patch("builtins.open", mock_open()) as mock_file:
         mock_file.side_effect = PermissionError("Permission denied")
         result = get_input_files([str(file_path)])
@@ -1157,12 +1413,39 @@ def test_display_only_supported_streams(capsys):
     assert "Unsupported subtitle streams:" not in captured.out
 
 
+def test_ffmpeg_and_ffprobe_missing(caplog):
+    with (
+        patch("shuku.cli.shutil.which", return_value=None),
+        patch("shuku.cli.FFmpeg") as mock_ffmpeg,
+        caplog.at_level(logging.DEBUG),
+        pytest.raises(SystemExit) as exc_info,
+    ):
+        verify_ffmpeg_and_ffprobe_availability()
+    assert exc_info.value.code == 1
+    assert "ffmpeg not found. Make sure FFmpeg is installed" in caplog.text
+    mock_ffmpeg.assert_not_called()
+
+
+def test_ffmpeg_versions_not_checked_without_debug_logging(caplog):
+    with (
+        patch("shuku.cli.shutil.which", return_value="/usr/bin/tool"),
+        patch("shuku.cli.FFmpeg") as mock_ffmpeg,
+        caplog.at_level(logging.INFO),
+    ):
+        verify_ffmpeg_and_ffprobe_availability()
+    mock_ffmpeg.assert_not_called()
+    assert "not found" not in caplog.text
+
+
 def test_ffmpeg_exception_handling(monkeypatch, caplog):
     mock_ffmpeg = MagicMock()
     mock_ffmpeg().option().execute.side_effect = Exception("Mocked exception")
     with patch("sys.exit") as mock_exit:
-        with patch("shuku.cli.FFmpeg", mock_ffmpeg):
-            with caplog.at_level(logging.ERROR):
+        with (
+            patch("shuku.cli.FFmpeg", mock_ffmpeg),
+            patch("shuku.cli.shutil.which", return_value="/usr/bin/tool"),
+        ):
+            with caplog.at_level(logging.DEBUG):
                 verify_ffmpeg_and_ffprobe_availability()
                 assert "ffmpeg not found or not working properly" in caplog.text
                 assert "ffprobe not found or not working properly" in caplog.text
@@ -1173,7 +1456,10 @@ def test_ffmpeg_exception_handling(monkeypatch, caplog):
 def test_ffmpeg_and_ffprobe_available(caplog):
     mock_ffmpeg = MagicMock()
     mock_ffmpeg().option().execute.return_value = b"ffmpeg version 4.2.1"
-    with patch("shuku.cli.FFmpeg", mock_ffmpeg):
+    with (
+        patch("shuku.cli.FFmpeg", mock_ffmpeg),
+        patch("shuku.cli.shutil.which", return_value="/usr/bin/tool"),
+    ):
         with caplog.at_level(logging.DEBUG):
             verify_ffmpeg_and_ffprobe_availability()
             assert "ffmpeg version: 4.2.1" in caplog.text
@@ -1273,6 +1559,29 @@ def test_create_condensed_subtitles_negative_delay(tmp_path, sample_subs, base_c
     assert output_subs[1].text == "Second subtitle"
 
 
+def test_create_condensed_subtitles_skips_lines_between_segments(
+    tmp_path, base_context
+):
+    subs = pysubs2.SSAFile.from_string("""1
+00:00:01,000 --> 00:00:02,000
+Clipped
+
+2
+00:00:02,500 --> 00:00:02,800
+Between segments
+
+3
+00:00:03,000 --> 00:00:04,000
+Kept
+""")
+    create_condensed_subtitles(base_context, subs, [(0.5, 1.5), (3.0, 5.0)])
+    output_subs = pysubs2.load(str(tmp_path / "input (condensed).srt"))
+    assert [(sub.start, sub.end, sub.text) for sub in output_subs] == [
+        (500, 1000, "Clipped"),
+        (1000, 2000, "Kept"),
+    ]
+
+
 @pytest.fixture
 def mock_stream_info():
     return {
@@ -1502,6 +1811,15 @@ def test_sort_subtitle_streams_preferred_language():
     assert sorted_streams[1]["tags"]["language"] == "eng"
 
 
+def test_sort_subtitle_streams_preferred_language_case_insensitive():
+    streams = [
+        {"tags": {"language": "eng", "title": "English"}},
+        {"tags": {"language": "jpn", "title": "Japanese"}},
+    ]
+    sorted_streams = sort_subtitle_streams(streams, ["JPN", "eng"])
+    assert [s["tags"]["language"] for s in sorted_streams] == ["jpn", "eng"]
+
+
 def test_sort_subtitle_streams_forced_subtitles():
     streams = [
         {"tags": {"language": "eng", "title": "English", "forced": "0"}},
@@ -1547,6 +1865,24 @@ def test_sort_subtitle_streams_individual_penalties(keyword):
     assert sorted_streams[1]["tags"]["title"] == f"English with {keyword}"
 
 
+def test_sort_subtitle_streams_counts_each_penalty_keyword_once():
+    streams = [
+        {"tags": {"language": "eng", "title": "Signs & Songs"}},
+        {"tags": {"language": "eng", "title": "Signs (signs only)"}},
+    ]
+    sorted_streams = sort_subtitle_streams(streams, ["eng"])
+    assert sorted_streams[0]["tags"]["title"] == "Signs (signs only)"
+
+
+def test_sort_subtitle_streams_counts_overlapping_penalty_keywords():
+    streams = [
+        {"tags": {"language": "eng", "title": "ccomment"}},
+        {"tags": {"language": "eng", "title": "cc"}},
+    ]
+    sorted_streams = sort_subtitle_streams(streams, ["eng"])
+    assert sorted_streams[0]["tags"]["title"] == "cc"
+
+
 def test_extract_subtitles_logs_sorting(base_context, sample_streams, caplog):
     base_context.config["subtitle_languages"] = ["spa", "eng"]
     base_context.args.sub_track_id = None
@@ -1592,18 +1928,39 @@ def test_find_matching_subtitle_file_integration(base_context):
     }
     with (
         patch("os.path.exists") as mock_exists,
-        patch("os.listdir") as mock_listdir,
+        patch("shuku.cli.list_subtitle_files") as mock_list_subs,
         patch("shuku.cli.clean_filename") as mock_clean,
         patch("shuku.cli.character_based_similarity") as mock_similarity,
     ):
         mock_exists.return_value = False
-        mock_listdir.return_value = ["video_similar.srt", "unrelated.srt"]
+        mock_list_subs.return_value = ("video_similar.srt", "unrelated.srt")
         mock_clean.side_effect = lambda x: x.split(".")[0]
         mock_similarity.side_effect = [0.85, 0.3]
         result = find_matching_subtitle_file(base_context, "/path/to", "video")
         assert result == "/path/to/video_similar.srt"
 
 
+def test_list_subtitle_files_refreshes_when_directory_changes(tmp_path):
+    (tmp_path / "episode01.srt").touch()
+    (tmp_path / "episode01.mkv").touch()
+    assert list_subtitle_files(str(tmp_path)) == ("episode01.srt",)
+    (tmp_path / "episode02.ASS").touch()
+    os.utime(tmp_path, ns=(0, 0))
+    assert sorted(list_subtitle_files(str(tmp_path))) == [
+        "episode01.srt",
+        "episode02.ASS",
+    ]
+
+
+def test_character_based_similarity_skips_candidates_that_cannot_win():
+    assert character_based_similarity("show s01e01", "show s01e01") == 1.0
+    # The length-based upper bound (2 * 4 / 19) can't beat 0.9.
+    assert character_based_similarity("show", "show s01e01 ova", 0.9) == 0.0
+    assert character_based_similarity("show", "show s01e01 ova") == pytest.approx(
+        8 / 19
+    )
+
+
 def test_generate_output_path_with_clean_output_filename(tmp_path):
     messy_filename = "[OBEY-Me] Show S01E01 (BD 1920x1080 x264 FLAC).mkv"
     context = Context.create(
@@ -1867,6 +2224,32 @@ def test_prepare_filename_for_display(input_filename, expected_output):
     assert prepare_filename_for_display(input_filename) == expected_output
 
 
+@pytest.mark.parametrize(
+    "filename, expected",
+    [
+        (
+            "Show.S01E01.1080p.WEB-DL.H.264-ABc.mkv",
+            "Show.S01E01.1080p.WEB-DL.H.264.mkv",
+        ),
+        (
+            "Movie.2020.1080p.BluRay-SkipTheTalk.mkv",
+            "Movie.2020.1080p.mkv",
+        ),
+        ("Movie.2020.FLUX.mkv", "Movie.2020.mkv"),
+        ("Movie.2020.lowercase.mkv", "Movie.2020.lowercase.mkv"),
+        ("Movie 2020 ENG.mkv", "Movie 2020 .mkv"),
+        ("No extension-ABC", "No extension-ABC"),
+    ],
+)
+def test_strip_release_tags(filename, expected):
+    assert strip_release_tags(filename) == expected
+
+
+def test_strip_release_tags_handles_many_dashes():
+    filename = "Name." + "-a" * 5000 + ".mkv"
+    assert strip_release_tags(filename) == filename
+
+
 @pytest.mark.parametrize(
     "filename, directory_name, expected",
     [
@@ -2066,6 +2449,14 @@ def test_extract_season_and_episode(filename, directory_name, expected):
     assert extract_season_and_episode(filename, directory_name) == expected
 
 
+def test_extract_season_and_episode_without_digits_skips_patterns(monkeypatch):
+    combined_pattern = MagicMock()
+    monkeypatch.setattr("shuku.cli._SEASON_RE", combined_pattern)
+    monkeypatch.setattr("shuku.cli._EPISODE_RE", combined_pattern)
+    assert extract_season_and_episode("Some Movie", "Movies") == ("01", "01")
+    combined_pattern.match.assert_not_called()
+
+
 @pytest.mark.parametrize(
     "external_subtitle_search,expected_result",
     [
@@ -2120,6 +2511,17 @@ def test_generate_output_path_cli_overrides_config(base_context, tmp_path):
     assert result == expected
 
 
+def test_generate_output_path_creates_directory_once(base_context, tmp_path):
+    base_context.config["output_directory"] = str(tmp_path / "outputs")
+    base_context.config["output_suffix"] = ""
+    with patch("shuku.cli.Path.mkdir") as mock_mkdir:
+        audio_path = generate_output_path(base_context, "mp3")
+        subtitle_path = generate_output_path(base_context, "srt")
+    mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
+    assert audio_path == str(tmp_path / "outputs" / "input.mp3")
+    assert subtitle_path == str(tmp_path / "outputs" / "input.srt")
+
+
 def test_generate_output_path_uses_input_directory(base_context):
     base_context.config.pop("output_directory", None)
     base_context.args.output = None
@@ -2132,14 +2534,9 @@ def test_generate_output_path_uses_input_directory(base_context):
 @pytest.mark.parametrize(
     "stream_index,codec,expected_ext",
     [
-        ("1", "aac", "m4a"),  # First stream, known codec.
-        ("2", "flac", "flac"),  # Second stream, known codec.
-        # Third stream, known codec.
-        (
-            "3",
-            "libmp3lame",
-            "mp3",
-        ),
+        ("0", "aac", "m4a"),  # First stream, known codec.
+        ("1", "flac", "flac"),  # Second stream, known codec.
+        ("2", "libmp3lame", "mp3"),  # Third stream, known codec.
     ],
 )
 def test_get_audio_extension_copy_with_valid_stream(
@@ -2147,15 +2544,14 @@ def test_get_audio_extension_copy_with_valid_stream(
 ):
     base_context.config["condensed_audio.audio_codec"] = "copy"
     base_context.selected_audio_stream = stream_index
-    stream_idx = int(stream_index) - 1
-    base_context.stream_info["audio"][stream_idx]["codec_name"] = codec
+    base_context.stream_info["audio"][int(stream_index)]["codec_name"] = codec
     result = get_audio_extension(base_context)
     assert result == expected_ext
 
 
 def test_get_audio_extension_copy_with_unknown_codec(base_context):
     base_context.config["condensed_audio.audio_codec"] = "copy"
-    base_context.selected_audio_stream = "1"
+    base_context.selected_audio_stream = "0"
     base_context.stream_info["audio"][0]["codec_name"] = "unknown_codec"
     result = get_audio_extension(base_context)
     assert result == "mkv"
@@ -2170,7 +2566,7 @@ def test_get_audio_extension_copy_with_out_of_bounds_index(base_context):
 
 def test_get_audio_extension_copy_with_missing_codec_name(base_context):
     base_context.config["condensed_audio.audio_codec"] = "copy"
-    base_context.selected_audio_stream = "1"
+    base_context.selected_audio_stream = "0"
     base_context.stream_info["audio"][0].pop("codec_name", None)
     result = get_audio_extension(base_context)
     assert result == "mkv"
@@ -2209,6 +2605,34 @@ def test_get_audio_extension_direct_codec(base_context, codec, expected_ext):
     assert result == expected_ext
 
 
+def test_get_audio_extension_copy_matches_stream_by_index(base_context):
+    # Video and subtitle streams come first, so audio starts at index 3.
+    base_context.config["condensed_audio.audio_codec"] = "copy"
+    base_context.stream_info["audio"] = [
+        {"index": 3, "codec_name": "flac"},
+        {"index": 4, "codec_name": "aac"},
+    ]
+    base_context.selected_audio_stream = "4"
+    assert get_audio_extension(base_context) == "m4a"
+
+
+def test_get_audio_extension_uses_stored_original_codec(base_context):
+    base_context.config["condensed_audio.audio_codec"] = "copy"
+    base_context.selected_audio_stream = "99"
+    base_context.original_audio_codec = "flac"
+    assert get_audio_extension(base_context) == "flac"
+
+
+def test_get_audio_extension_is_resolved_once(base_context):
+    base_context.config["condensed_audio.audio_codec"] = "flac"
+    with patch(
+        "shuku.cli.resolve_audio_extension", return_value="flac"
+    ) as mock_resolve:
+        assert get_audio_extension(base_context) == "flac"
+        assert get_audio_extension(base_context) == "flac"
+    mock_resolve.assert_called_once_with(base_context)
+
+
 def test_extract_speech_timing_respects_subtitle_delay(base_context):
     subs = pysubs2.SSAFile()
     subs.append(pysubs2.SSAEvent(start=1000, end=2000, text="Line 1"))  # 1-2 seconds.
@@ -2306,6 +2730,40 @@ def test_filter_chapters_in_place_basic(chapter_subs):
     assert [sub.text for sub in chapter_subs] == expected_texts
 
 
+def test_filter_chapters_in_place_unsorted_nested_intervals(chapter_subs):
+    # (12, 15) sorts after (10, 1000) but must not hide that longer interval.
+    skip_intervals = [(1390.0, 1400.0), (45.0, 60.0), (10.0, 1000.0), (12.0, 15.0)]
+    filter_chapters_in_place(chapter_subs, skip_intervals)
+    assert [sub.text for sub in chapter_subs] == ["Preview of next episode!"]
+
+
+def test_filter_events_in_place_applies_patterns_and_chapters(chapter_subs):
+    events = chapter_subs.events
+    skip_patterns = [re.compile(r"^More")]
+    filter_events_in_place(chapter_subs, skip_patterns, [(0.0, 30.0)])
+    assert [sub.text for sub in chapter_subs] == [
+        "First real dialogue.",
+        "Preview of next episode!",
+    ]
+    assert chapter_subs.events is events
+
+
+def test_extract_speech_timing_filters_chapters_before_delay(
+    base_context, chapter_subs
+):
+    base_context.args.sub_delay = 15000
+    base_context.config["padding"] = 0
+    segments = extract_speech_timing_from_subtitles(
+        base_context, chapter_subs, [re.compile("^More")], [(0.0, 30.0)]
+    )
+    # The opening line (20s) is skipped even though the delay moves it past 30s.
+    assert [sub.text for sub in chapter_subs] == [
+        "First real dialogue.",
+        "Preview of next episode!",
+    ]
+    assert segments == [(65.0, 67.0), (1425.0, 1427.0)]
+
+
 def test_filter_chapters_in_place_no_intervals(chapter_subs):
     skip_intervals: list[tuple[float, float]] = []
     original_subs = chapter_subs.events.copy()
@@ -2334,6 +2792,14 @@ def test_get_skipped_chapter_intervals_case_insensitive(base_context):
     assert get_skipped_chapter_intervals(base_context) == expected
 
 
+def test_get_skipped_chapter_intervals_config_titles_case_insensitive(base_context):
+    base_context.config["skip_chapters"] = ["Opening Credits"]
+    base_context.stream_info["chapters"] = [
+        {"start_time": "0.0", "end_time": "30.0", "tags": {"title": "opening credits"}},
+    ]
+    assert get_skipped_chapter_intervals(base_context) == [(0.0, 30.0)]
+
+
 def test_get_skipped_chapter_intervals_logs_matched_chapters(base_context, caplog):
     base_context.config["skip_chapters"] = ["opening", "ending", "preview"]
     base_context.stream_info["chapters"] = [
@@ -2450,7 +2916,7 @@ Line in opening
 2
 00:00:35,000 --> 00:00:36,000
 Line in main content""")
-    config = deepcopy(DEFAULT_CONFIG)
+    config = dict(DEFAULT_CONFIG)
     config["skip_chapters"] = ["opening"]
     config["condensed_audio.enabled"] = False
     config["condensed_video.enabled"] = False
@@ -2747,6 +3213,116 @@ def test_keyboard_interrupt_exits_gracefully(caplog):
         mock_print.assert_called_once_with()
 
 
+def test_parse_arguments_jobs():
+    with patch("sys.argv", ["shuku", "input.mp4"]):
+        assert parse_arguments().jobs == 1
+    with patch("sys.argv", ["shuku", "-j", "4", "input.mp4"]):
+        assert parse_arguments().jobs == 4
+    with patch("sys.argv", ["shuku", "--jobs", "0", "input.mp4"]):
+        with pytest.raises(SystemExit):
+            parse_arguments()
+
+
+def test_process_file_safely_logs_errors(caplog):
+    error = FileProcessingError("video.mkv", "No valid segments found")
+    with patch("shuku.cli.process_file", side_effect=error):
+        assert process_file_safely("video.mkv", {}, argparse.Namespace()) is False
+    assert "Error processing video.mkv: No valid segments found" in caplog.text
+    with patch("shuku.cli.process_file"):
+        assert process_file_safely("video.mkv", {}, argparse.Namespace()) is True
+
+
+def test_process_files_in_parallel_counts_successes(caplog):
+    def fake_process_file(file_path, config, args):
+        if file_path == "bad.mkv":
+            raise FileProcessingError(file_path, "No streams found")
+
+    with (
+        patch("shuku.cli.ProcessPoolExecutor", ThreadPoolExecutor),
+        patch("shuku.cli.init_worker"),
+        patch("shuku.cli.process_file", side_effect=fake_process_file),
+    ):
+        successful_files = process_files_in_parallel(
+            ["a.mkv", "bad.mkv", "b.mkv"], {}, argparse.Namespace(), 2
+        )
+    assert successful_files == 2
+    assert "Error processing bad.mkv: No streams found" in caplog.text
+
+
+def test_main_uses_parallel_processing_with_jobs(tmp_path):
+    files = [str(tmp_path / f"{name}.mkv") for name in ("a", "b", "c")]
+    args = argparse.Namespace(
+        loglevel=None, log_file=None, init=False, config="none", input=files, jobs=8
+    )
+    with (
+        patch("shuku.cli.parse_arguments", return_value=args),
+        patch("shuku.cli.setup_initial_logging"),
+        patch("shuku.cli.update_logging_level"),
+        patch("shuku.cli.verify_ffmpeg_and_ffprobe_availability"),
+        patch("shuku.cli.get_input_files", return_value=files),
+        patch("shuku.cli.process_files_in_parallel", return_value=3) as mock_parallel,
+        patch("shuku.cli.process_file") as mock_process_file,
+    ):
+        main()
+    mock_parallel.assert_called_once()
+    # Never more workers than files.
+    assert mock_parallel.call_args.args[3] == 3
+    mock_process_file.assert_not_called()
+
+
+def test_main_disables_prompts_for_parallel_jobs(tmp_path, caplog):
+    files = [str(tmp_path / f"{name}.mkv") for name in ("a", "b")]
+    args = argparse.Namespace(
+        loglevel=None, log_file=None, init=False, config="none", input=files, jobs=2
+    )
+    with (
+        patch("shuku.cli.parse_arguments", return_value=args),
+        patch("shuku.cli.setup_initial_logging"),
+        patch("shuku.cli.update_logging_level"),
+        patch("shuku.cli.verify_ffmpeg_and_ffprobe_availability"),
+        patch("shuku.cli.get_input_files", return_value=files),
+        patch("shuku.cli.process_files_in_parallel", return_value=2) as mock_parallel,
+    ):
+        main()
+    # Workers can't read stdin, so "ask" is answered before dispatching.
+    assert mock_parallel.call_args.args[1]["if_file_exists"] == "rename"
+    assert mock_parallel.call_args.args[2].interactive is False
+    assert "existing output files will be renamed" in caplog.text
+
+
+def test_disable_prompts_keeps_explicit_if_file_exists():
+    config = {"if_file_exists": "skip"}
+    args = argparse.Namespace()
+    assert disable_prompts(config, args) == {"if_file_exists": "skip"}
+    assert args.interactive is False
+
+
+@pytest.mark.parametrize("stream_type", ["audio", "subtitle"])
+def test_display_and_select_stream_non_interactive(stream_type, caplog):
+    streams = [
+        {"index": 3, "codec_name": "ass", "tags": {"language": "jpn"}},
+        {"index": 4, "codec_name": "subrip", "tags": {"language": "eng"}},
+    ]
+    with caplog.at_level(logging.INFO), patch("builtins.input") as mock_input:
+        assert display_and_select_stream(streams, stream_type, interactive=False) == "3"
+    mock_input.assert_not_called()
+    assert f"Using first {stream_type} stream" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "jobs, expected",
+    [
+        (1, {}),
+        (4, {"threads": 2}),
+        (16, {"threads": 1}),
+    ],
+)
+def test_get_ffmpeg_thread_options(base_context, jobs, expected):
+    base_context.args.jobs = jobs
+    with patch("shuku.cli.CPU_COUNT", 8):
+        assert get_ffmpeg_thread_options(base_context) == expected
+
+
 def test_resolve_cover_image_explicit_path_not_found_returns_none(base_context):
     base_context.args.cover = "/nonexistent/cover.jpg"
     result = resolve_cover_image(base_context)
@@ -2890,3 +3466,13 @@ def test_encode_final_audio_mp3_with_cover_adds_id3v2_version(base_context, tmp_
         assert output_call[1]["id3v2_version"] == "3"
         assert output_call[1]["c:v"] == "mjpeg"
         assert output_call[1]["disposition:v"] == "attached_pic"
+
+
+def test_progress_bar_redraws_only_when_output_changes(capsys):
+    progress_bar = ProgressBar(10000)
+    for _ in range(10000):
+        progress_bar.update(1)
+    progress_bar.close()
+    output = capsys.readouterr().out
+    assert output.count("\r") <= 202
+    assert output.endswith("| 10000/10000\n")
@@ -14,6 +14,7 @@ from shuku.config import (
     ConfigItem,
     ConfigValidationError,
     dump_default_config,
+    flatten_dict,
     generate_config_content,
     generate_item_content,
     get_default_config_path,
@@ -83,15 +84,13 @@ def test_nested_invalid_setting(caplog):
 def test_multiple_unknown_fields(caplog):
     config = {
         "condensed_audio.enabled": True,
-        "unknown_field1": "value1",
         "unknown_field2": "value2",
+        "unknown_field1": "value1",
     }
     with pytest.raises(SystemExit) as exc_info:
         validate_config(config)
     assert exc_info.value.code == 1
-    assert "Unknown configuration key" in caplog.text
-    assert "unknown_field1" in caplog.text
-    assert "unknown_field2" in caplog.text
+    assert "Unknown configuration keys: unknown_field1, unknown_field2" in caplog.text
 
 
 def test_load_config_no_file():
@@ -130,10 +129,26 @@ def test_load_config_no_file():
             {"condensed_audio.enabled": True, "audio_languages": [1, 2, 3]},
             lambda msg: "audio_languages" in msg,
         ),
+        (
+            {"condensed_audio.enabled": True, "skip_chapters": "opening"},
+            lambda msg: "skip_chapters" in msg,
+        ),
         (
             {"condensed_audio.enabled": True, "padding": "not_a_number"},
             lambda msg: "padding" in msg,
         ),
+        (
+            {"condensed_audio.enabled": True, "padding": True},
+            lambda msg: "padding" in msg,
+        ),
+        (
+            {"condensed_audio.enabled": True, "segment_extraction_workers": 0},
+            lambda msg: "segment_extraction_workers" in msg,
+        ),
+        (
+            {"condensed_audio.enabled": True, "thread_queue_size": 0},
+            lambda msg: "thread_queue_size" in msg,
+        ),
         (
             {"condensed_audio.enabled": True, "loglevel": "invalid_level"},
             lambda msg: "loglevel" in msg and "Must be one of" in msg,
@@ -164,6 +179,14 @@ def test_default_config_is_valid():
     validate_config(DEFAULT_CONFIG)
 
 
+def test_default_config_is_read_only():
+    with pytest.raises(TypeError):
+        DEFAULT_CONFIG["loglevel"] = "debug"  # type: ignore[index]
+    config = load_config("none")
+    config["loglevel"] = "debug"
+    assert DEFAULT_CONFIG["loglevel"] != "debug"
+
+
 def test_resolve_aliases():
     test_config = {
         "condensed_audio.audio_codec": "mp3",
@@ -227,6 +250,23 @@ def test_resolve_aliases_with_unknown_key():
     assert "unknown_key" in resolved_config
 
 
+def test_flatten_dict_keeps_custom_ffmpeg_args_nested():
+    nested = {
+        "loglevel": "info",
+        "condensed_audio": {
+            "enabled": True,
+            "custom_ffmpeg_args": {"af": "loudnorm"},
+        },
+        "condensed_video": {"enabled": False},
+    }
+    assert list(flatten_dict(nested).items()) == [
+        ("loglevel", "info"),
+        ("condensed_audio.enabled", True),
+        ("condensed_audio.custom_ffmpeg_args", {"af": "loudnorm"}),
+        ("condensed_video.enabled", False),
+    ]
+
+
 @pytest.mark.parametrize(
     "system, env_vars, expected_path",
     [
@@ -618,6 +658,8 @@ def test_audio_codec_quality(config_type, codec, quality, should_pass):
         ("libmp3lame", "v11", "unusually high"),
         ("libmp3lame", "128k", None),
         ("libmp3lame", "320k", None),
+        ("libopus", "6k", None),
+        ("libopus", "500k", None),
     ],
 )
 def test_warnings(codec, quality, expected_warning, caplog):
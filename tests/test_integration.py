@@ -20,8 +20,11 @@ from shuku.utils import REPOSITORY
 def isolate_config_environment(monkeypatch, tmp_path):
     # Set XDG_CONFIG_HOME to a temporary directory.
     monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+    # Keep the subtitle cache out of the user's cache directory.
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
     # Ensure APPDATA is not set (for Windows).
     monkeypatch.delenv("APPDATA", raising=False)
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path / "cache"))
     # Set HOME to a non-existent path to avoid reading from ~/.config.
     monkeypatch.setenv("HOME", str(tmp_path / "nonexistent"))
 
@@ -722,3 +725,70 @@ def test_cover_art_disabled_via_config(tmp_path):
     assert output_file.exists()
     cover_info = get_cover_art_info(str(output_file))
     assert cover_info is None, "Cover art embedded despite config disable"
+
+
+def test_condensed_video_keeps_source_frame_rate(tmp_path):
+    # Selecting frames in a single pass used to fall back to 25 fps on mp4.
+    source = tmp_path / "ntsc.mp4"
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-v",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            "testsrc2=duration=40:size=320x240:rate=30000/1001",
+            "-f",
+            "lavfi",
+            "-i",
+            "sine=duration=40",
+            "-c:v",
+            "libx264",
+            "-c:a",
+            "aac",
+            str(source),
+        ],
+        check=True,
+    )
+    source.with_suffix(".srt").write_text(
+        "1\n00:00:05,000 --> 00:00:15,000\nOne\n\n"
+        "2\n00:00:25,000 --> 00:00:35,000\nTwo\n"
+    )
+    config_file = tmp_path / "config.toml"
+    config_file.write_text("""
+    clean_output_filename = false
+    padding = 0
+    [condensed_video]
+    enabled = true
+    video_codec = "libx264"
+    audio_codec = "aac"
+    [condensed_audio]
+    enabled = false
+    [condensed_subtitles]
+    enabled = false
+    """)
+    result = run_shuku(str(source), str(tmp_path), str(config_file))
+    assert result.returncode == 0, result.stderr
+    probe = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-count_frames",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "stream=avg_frame_rate,nb_read_frames",
+            "-of",
+            "json",
+            str(tmp_path / "ntsc (condensed).mp4"),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    stream = json.loads(probe.stdout)["streams"][0]
+    assert stream["avg_frame_rate"] == "30000/1001"
+    # 20 seconds of selected content at 29.97 fps.
+    assert abs(int(stream["nb_read_frames"]) - 20 * 30000 / 1001) < 10
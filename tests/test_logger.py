@@ -10,6 +10,7 @@ from shuku.cli import format_duration, log_execution_time, parse_arguments
 from shuku.logging_setup import (
     DEFAULT_LOG_LEVEL,
     SUCCESS,
+    CuteFormatter,
     addLoggingLevel,
     setup_initial_logging,
     update_logging_level,
@@ -23,12 +24,27 @@ def test_add_logging_level():
     assert hasattr(logging, "success")
 
 
-def test_add_logging_level_redefine():
+def test_add_logging_level_redefine_is_noop():
+    log_for_level = logging.getLoggerClass().success  # type: ignore
+    addLoggingLevel("SUCCESS", SUCCESS)
+    assert logging.getLoggerClass().success is log_for_level  # type: ignore
+
+
+def test_add_logging_level_redefine_with_other_value():
     with pytest.raises(AttributeError) as excinfo:
-        addLoggingLevel("SUCCESS", SUCCESS)
+        addLoggingLevel("SUCCESS", SUCCESS + 1)
     assert "SUCCESS already defined in logging module" in str(excinfo.value)
 
 
+def test_reload_logging_setup():
+    import importlib
+
+    import shuku.logging_setup
+
+    importlib.reload(shuku.logging_setup)
+    assert logging.getLevelName(SUCCESS) == "SUCCESS"
+
+
 def test_log_for_level_below_level():
     logger = logging.getLogger("test_logger")
     logger.setLevel(logging.WARNING)
@@ -324,6 +340,23 @@ def test_setup_initial_logging_file_exception():
         )
 
 
+@pytest.mark.parametrize(
+    "level, emoji",
+    [
+        (logging.DEBUG, "🐛"),
+        (SUCCESS, "✅"),
+        (logging.ERROR, "❌"),
+        (15, "💬️"),
+    ],
+)
+def test_cute_formatter(level, emoji):
+    record = logging.LogRecord(
+        "shuku", level, __file__, 1, "Hello %s", ("there",), None
+    )
+    record.created = time.mktime((2024, 1, 1, 12, 34, 56, 0, 0, -1))
+    assert CuteFormatter().format(record) == f"[12:34:56] {emoji} Hello there"
+
+
 @pytest.mark.parametrize(
     "input_seconds, expected_output",
     [